@@ -0,0 +1,239 @@
+"""Statystyki developerów i projektów z tabel agregatów (`OpenTaskStats`,
+`ClosedTaskWeeklyStats`, `CycleTimeStats`).
+
+Każdy task wnosi do agregatów swój wkład (`contributions`). Zmiana taska
+odejmuje wkład starej wersji i dodaje wkład nowej (`apply`) w tej samej
+transakcji, więc agregaty nie rozjeżdżają się z taskami. Odczyt czyta tylko
+wiersze agregatów developera albo projektu - ich liczba zależy od liczby
+projektów i tygodni, a nie od liczby tasków.
+
+Przebudowa wszystkich agregatów z tasków (np. po ręcznej zmianie w bazie):
+    python -m app.analytics
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from .database import engine
+from . import models
+
+# kolumny taska, od których zależą agregaty
+TaskSnapshot = namedtuple(
+    "TaskSnapshot",
+    [
+        "project_id",
+        "developer_id",
+        "state",
+        "estimation",
+        "specialization",
+        "datetime_assigned",
+        "datetime_completed",
+    ],
+)
+TASK_COLUMNS = [getattr(models.Task, field) for field in TaskSnapshot._fields]
+OPEN_STATES = ("NOT_ASSIGNED", "IN_PROGRESS")
+REBUILD_CHUNK_ROWS = 10_000
+
+# tabela -> (kolumny klucza, kolumny sumowane)
+AGGREGATES = {
+    models.OpenTaskStats: (
+        ("project_id", "developer_id", "state"),
+        ("task_count", "estimation_sum"),
+    ),
+    models.ClosedTaskWeeklyStats: (
+        ("project_id", "developer_id", "week"),
+        ("task_count",),
+    ),
+    models.CycleTimeStats: (
+        ("project_id", "developer_id", "specialization", "estimation"),
+        ("task_count", "seconds_sum"),
+    ),
+}
+
+
+def snapshot(task):
+    """Migawka taska (obiekt modelu, wiersz zapytania albo słownik z insertu)."""
+    if isinstance(task, dict):
+        values = [task.get(field) for field in TaskSnapshot._fields]
+        # w słowniku z bulk insertu brak stanu oznacza wartość domyślną kolumny
+        values[2] = values[2] or "NOT_ASSIGNED"
+    else:
+        values = [getattr(task, field) for field in TaskSnapshot._fields]
+    # enumy ze schematów (str) zapisujemy jak zwykłe napisy
+    values[2] = getattr(values[2], "value", values[2])
+    values[4] = getattr(values[4], "value", values[4])
+    return TaskSnapshot(*values)
+
+
+def week_start(moment):
+    return moment.date() - timedelta(days=moment.weekday())
+
+
+def contributions(task):
+    """Wiersze agregatów, do których liczy się task: (tabela, klucz, wartości)."""
+    developer_id = task.developer_id or 0
+    if task.state in OPEN_STATES:
+        yield (
+            models.OpenTaskStats,
+            (task.project_id, developer_id, task.state),
+            (1, task.estimation),
+        )
+    elif task.state == "CLOSED" and task.datetime_completed is not None:
+        yield (
+            models.ClosedTaskWeeklyStats,
+            (task.project_id, developer_id, week_start(task.datetime_completed)),
+            (1,),
+        )
+        if task.developer_id and task.datetime_assigned is not None:
+            seconds = (task.datetime_completed - task.datetime_assigned).total_seconds()
+            yield (
+                models.CycleTimeStats,
+                (task.project_id, developer_id, task.specialization, task.estimation),
+                (1, seconds),
+            )
+
+
+def collect(deltas, tasks, sign=1):
+    # sumuje wkład tasków do deltas: tabela -> klucz -> lista wartości
+    for task in tasks:
+        for table, key, values in contributions(task):
+            entry = deltas.setdefault(table, {}).setdefault(key, [0] * len(values))
+            for i, value in enumerate(values):
+                entry[i] += sign * value
+    return deltas
+
+
+def aggregate_rows(table, deltas):
+    key_columns, value_columns = AGGREGATES[table]
+    return [
+        dict(zip(key_columns + value_columns, key + tuple(values)))
+        for key, values in deltas.items()
+        # np. zmiana nazwy taska - wkład starej i nowej wersji się znosi
+        if any(values)
+    ]
+
+
+def apply(db: Session, removed=(), added=()):
+    """Odejmuje od agregatów wkład migawek `removed` i dodaje wkład `added`, po
+    jednym upsercie (executemany) na tabelę. Commit robi wywołujący."""
+    deltas = collect(collect({}, removed, -1), added)
+    dialect = db.get_bind().dialect.name
+    upsert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    for table, table_deltas in deltas.items():
+        values = aggregate_rows(table, table_deltas)
+        if not values:
+            continue
+        key_columns, value_columns = AGGREGATES[table]
+        statement = upsert(table.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                column: table.__table__.c[column] + statement.excluded[column]
+                for column in value_columns
+            },
+        )
+        db.execute(statement, values)
+
+
+def rebuild(connection):
+    """Liczy agregaty od nowa ze wszystkich tasków (w transakcji `connection`).
+    Taski są czytane paczkami, w pamięci są tylko sumy."""
+    for table in AGGREGATES:
+        connection.execute(delete(table))
+    deltas = {}
+    result = connection.execute(select(*TASK_COLUMNS))
+    for chunk in result.partitions(REBUILD_CHUNK_ROWS):
+        collect(deltas, (snapshot(row) for row in chunk))
+    for table, table_deltas in deltas.items():
+        values = aggregate_rows(table, table_deltas)
+        if values:
+            connection.execute(insert(table.__table__), values)
+
+
+def read_open_stats(db: Session, condition, state):
+    task_count, estimation_sum = db.execute(
+        select(
+            func.coalesce(func.sum(models.OpenTaskStats.task_count), 0),
+            func.coalesce(func.sum(models.OpenTaskStats.estimation_sum), 0),
+        )
+        .where(condition(models.OpenTaskStats))
+        .where(models.OpenTaskStats.state == state)
+    ).one()
+    return {"tasks": task_count, "estimation": estimation_sum}
+
+
+def read_stats(db: Session, condition, weeks: int):
+    """Statystyki z wierszy agregatów spełniających `condition(tabela)`."""
+    since = week_start(datetime.utcnow()) - timedelta(weeks=weeks - 1)
+    closed_per_week = [
+        {"week": week, "closed": closed}
+        for week, closed in db.execute(
+            select(
+                models.ClosedTaskWeeklyStats.week,
+                func.sum(models.ClosedTaskWeeklyStats.task_count),
+            )
+            .where(condition(models.ClosedTaskWeeklyStats))
+            .where(models.ClosedTaskWeeklyStats.week >= since)
+            .group_by(models.ClosedTaskWeeklyStats.week)
+            .having(func.sum(models.ClosedTaskWeeklyStats.task_count) > 0)
+            .order_by(models.ClosedTaskWeeklyStats.week)
+        )
+    ]
+    cycle_time = [
+        {
+            "specialization": specialization,
+            "estimation": estimation,
+            "closed": closed,
+            "average_seconds": seconds / closed,
+        }
+        for specialization, estimation, closed, seconds in db.execute(
+            select(
+                models.CycleTimeStats.specialization,
+                models.CycleTimeStats.estimation,
+                func.sum(models.CycleTimeStats.task_count),
+                func.sum(models.CycleTimeStats.seconds_sum),
+            )
+            .where(condition(models.CycleTimeStats))
+            .group_by(
+                models.CycleTimeStats.specialization, models.CycleTimeStats.estimation
+            )
+            .having(func.sum(models.CycleTimeStats.task_count) > 0)
+            .order_by(
+                models.CycleTimeStats.specialization, models.CycleTimeStats.estimation
+            )
+        )
+    ]
+    return {"closed_per_week": closed_per_week, "cycle_time": cycle_time}
+
+
+def read_developer_stats(db: Session, developer_id: int, weeks: int):
+    def condition(table):
+        return table.developer_id == developer_id
+
+    return {
+        "developer_id": developer_id,
+        "in_progress": read_open_stats(db, condition, "IN_PROGRESS"),
+        **read_stats(db, condition, weeks),
+    }
+
+
+def read_project_stats(db: Session, project_id: int, weeks: int):
+    def condition(table):
+        return table.project_id == project_id
+
+    return {
+        "project_id": project_id,
+        "not_assigned": read_open_stats(db, condition, "NOT_ASSIGNED"),
+        "in_progress": read_open_stats(db, condition, "IN_PROGRESS"),
+        **read_stats(db, condition, weeks),
+    }
+
+
+if __name__ == "__main__":
+    # tu, a nie na górze - migrations importuje ten moduł
+    from .migrations import migrate
+
+    migrate()
+    with engine.begin() as connection:
+        rebuild(connection)
@@ -0,0 +1,12 @@
+from .base import AssignmentStrategy, SPECIALIZATIONS
+from .greedy import GreedyStrategy, balance_leftover_tasks
+from .optimal import OptimalStrategy
+
+STRATEGIES = {
+    GreedyStrategy.name: GreedyStrategy,
+    OptimalStrategy.name: OptimalStrategy,
+}
+
+
+def get_strategy(name, **options):
+    return STRATEGIES[name](**options)
@@ -0,0 +1,22 @@
+SPECIALIZATIONS = ["FRONTEND", "BACKEND", "UX/UI", "DEVOPS"]
+
+
+class AssignmentStrategy:
+    """Algorytm przydzielający zadania NOT_ASSIGNED developerom projektu.
+
+    `plan` dostaje zadania do przydzielenia, developerów projektu oraz statystyki
+    ukończeń z `crud.read_completion_stats` ((developer_id, estymacja) ->
+    [liczba zadań, suma sekund]) i zwraca słownik developer_id -> lista zadań.
+    Zadania, których nie da się nikomu przydzielić, są pomijane.
+    `capacity` to limit zadań na developera dla strategii, które go obsługują.
+    `loads` (developer_id -> (liczba zadań, suma estymacji)) to zadania, które
+    developer już ma z wcześniejszego planu - przy przeplanowaniu części zadań.
+    """
+
+    name = None
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+
+    def plan(self, tasks, developers, completion_stats, loads=None):
+        raise NotImplementedError
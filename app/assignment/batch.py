@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+from . import get_strategy
+
+load_dotenv()
+# procesy liczące przydziały wielu projektów; 1 - wszystko w procesie requestu.
+# Każdy worker uvicorna (WEB_CONCURRENCY, ustawia je też app.serve) ma własną
+# pulę, więc domyślnie dzielą między siebie rdzenie
+WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+BATCH_WORKERS = int(
+    os.getenv("ASSIGNMENT_BATCH_WORKERS", max(1, (os.cpu_count() or 1) // WEB_WORKERS))
+)
+
+# to, czego strategie potrzebują z taska - lekkie do przesłania do innego procesu
+AssignmentTask = namedtuple("AssignmentTask", ["id", "estimation", "specialization"])
+
+executor = None
+executor_lock = threading.Lock()
+
+
+def get_executor():
+    # pula powstaje przy pierwszym użyciu, a nie przy imporcie aplikacji. Procesy
+    # przez spawn, a nie fork: fork wielowątkowego procesu serwera (pula wątków,
+    # połączenia SQLite, zajęte blokady) potrafi zakleszczyć dziecko. Dzieci
+    # importują tylko app.assignment, bez bazy i aplikacji
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return executor
+
+
+def group_projects(project_developer_ids):
+    """Dzieli projekty na grupy połączone wspólnymi developerami (union-find).
+
+    Projekty z różnych grup nie dzielą nikogo, więc można je liczyć równolegle;
+    w obrębie grupy obciążenie developera przechodzi z projektu na projekt.
+    Grupy i projekty w nich są posortowane po id.
+    """
+    parent = {project_id: project_id for project_id in project_developer_ids}
+
+    def find(project_id):
+        while parent[project_id] != project_id:
+            parent[project_id] = parent[parent[project_id]]
+            project_id = parent[project_id]
+        return project_id
+
+    owner = {}
+    for project_id in sorted(project_developer_ids):
+        for developer_id in project_developer_ids[project_id]:
+            other = owner.setdefault(developer_id, project_id)
+            root, other_root = find(project_id), find(other)
+            if root != other_root:
+                parent[max(root, other_root)] = min(root, other_root)
+    groups = {}
+    for project_id in sorted(project_developer_ids):
+        groups.setdefault(find(project_id), []).append(project_id)
+    return list(groups.values())
+
+
+def plan_group(strategy, capacity, projects):
+    """Planuje po kolei projekty jednej grupy - (project_id, taski, developerzy,
+    statystyki) - i zwraca project_id -> (developer_id -> lista id tasków).
+
+    Każdy projekt dostaje obciążenie z poprzednich jako `loads`, więc developer
+    z kilku projektów nie jest liczony jak wolny w każdym z nich."""
+    planner = get_strategy(strategy, capacity=capacity)
+    loads = {}
+    result = {}
+    for project_id, tasks, developers, completion_stats in projects:
+        assignments = planner.plan(tasks, developers, completion_stats, loads)
+        changes = {}
+        for developer_id, planned in assignments.items():
+            changes[developer_id] = [task.id for task in planned]
+            count, estimation_sum = loads.get(developer_id, (0, 0))
+            loads[developer_id] = (
+                count + len(planned),
+                estimation_sum + sum(task.estimation for task in planned),
+            )
+        result[project_id] = changes
+    return result
+
+
+def plan_batch(strategy, capacity, projects, project_developer_ids):
+    """Planuje wiele projektów: grupy z `group_projects` idą do puli procesów,
+    a gdy jest jedna grupa albo jeden worker - w bieżącym procesie."""
+    by_id = {project[0]: project for project in projects}
+    groups = [
+        [by_id[project_id] for project_id in group if project_id in by_id]
+        for group in group_projects(
+            {project_id: project_developer_ids[project_id] for project_id in by_id}
+        )
+    ]
+    if BATCH_WORKERS <= 1 or len(groups) <= 1:
+        results = [plan_group(strategy, capacity, group) for group in groups]
+    else:
+        results = get_executor().map(
+            plan_group,
+            [strategy] * len(groups),
+            [capacity] * len(groups),
+            groups,
+        )
+    planned = {}
+    for result in results:
+        planned.update(result)
+    return planned
@@ -0,0 +1,142 @@
+import heapq
+import logging
+from .base import AssignmentStrategy, SPECIALIZATIONS
+
+logger = logging.getLogger(__name__)
+
+
+def balance_leftover_tasks(
+    tasks, developer_ids, developer_total_estimation, task_counts=None, capacity=None
+):
+    # kopiec (suma estymacji, pozycja na liście developerów, id) - przy remisie
+    # wygrywa developer wcześniej na liście, tak jak w poprzedniej wersji.
+    # Z `capacity` developer z `task_counts` zadaniami równymi limitowi wypada
+    heap = [
+        (developer_total_estimation[developer_id], position, developer_id)
+        for position, developer_id in enumerate(developer_ids)
+        if capacity is None or task_counts[developer_id] < capacity
+    ]
+    heapq.heapify(heap)
+    while tasks and heap:
+        task = tasks.pop()
+        total, position, developer_id = heap[0]
+        total += task.estimation
+        developer_total_estimation[developer_id] = total
+        if capacity is not None:
+            task_counts[developer_id] += 1
+            if task_counts[developer_id] >= capacity:
+                heapq.heappop(heap)
+                yield developer_id, task
+                continue
+        heapq.heapreplace(heap, (total, position, developer_id))
+        yield developer_id, task
+
+
+class GreedyStrategy(AssignmentStrategy):
+    """Każde zadanie dostaje historycznie najszybszy developer dla jego estymacji,
+    a zadania bez danych historycznych trafiają do najmniej obciążonych.
+
+    Z `capacity` developer, który ma już tyle zadań (razem z `loads`), nie
+    dostaje kolejnych - ani z historii, ani przy wyrównywaniu; zadania, których
+    nikt nie może wziąć, są pomijane. Bez `capacity` `loads` wpływa tylko na
+    wyrównywanie zadań bez historii.
+    """
+
+    name = "greedy"
+
+    def plan(self, tasks, developers, completion_stats, loads=None):
+        loads = loads or {}
+        # sprawdzane raz na przydział - przy wyłączonym DEBUG pętle nie logują nic
+        debug = logger.isEnabledFor(logging.DEBUG)
+        assignments = {}
+        fastest_developer_cache = {}
+
+        def find_fastest_developer(developer_ids, estimation):
+            key = (tuple(developer_ids), estimation)
+            if key in fastest_developer_cache:
+                return fastest_developer_cache[key]
+            average = 99999999
+            fastest_developer_id = -1
+            for dev_id in developer_ids:
+                stats = completion_stats.get((dev_id, estimation))
+                if stats is None:
+                    if debug:
+                        logger.debug(
+                            "no history developer_id=%s estimation=%s",
+                            dev_id,
+                            estimation,
+                        )
+                    continue
+                current_average = stats[1] / stats[0]
+                if debug:
+                    logger.debug(
+                        "history developer_id=%s estimation=%s average_seconds=%.1f",
+                        dev_id,
+                        estimation,
+                        current_average,
+                    )
+                if current_average < average:
+                    average = current_average
+                    fastest_developer_id = dev_id
+            fastest_developer_cache[key] = fastest_developer_id
+            return fastest_developer_id
+
+        for specialization in SPECIALIZATIONS:
+            developer_ids_in_specialization = [
+                d.id for d in developers if d.specialization == specialization
+            ]
+            tasks_in_specialization = [
+                t for t in tasks if t.specialization == specialization
+            ]
+            leftover_tasks = []
+            developer_total_estimation = {}
+            task_counts = {}
+            for d in developer_ids_in_specialization:
+                task_counts[d], developer_total_estimation[d] = loads.get(d, (0, 0))
+            # developerzy, którzy mogą dostać kolejne zadanie
+            available = [
+                d
+                for d in developer_ids_in_specialization
+                if self.capacity is None or task_counts[d] < self.capacity
+            ]
+            if debug:
+                logger.debug(
+                    "planning specialization=%s tasks=%s developers=%s",
+                    specialization,
+                    len(tasks_in_specialization),
+                    developer_ids_in_specialization,
+                )
+
+            for task in tasks_in_specialization:
+                # szukamy najszybszego historyczne deva do takiego zadania
+                developer_id = find_fastest_developer(available, task.estimation)
+                if developer_id != -1:
+                    assignments.setdefault(developer_id, []).append(task)
+                    developer_total_estimation[developer_id] += task.estimation
+                    task_counts[developer_id] += 1
+                    if (
+                        self.capacity is not None
+                        and task_counts[developer_id] >= self.capacity
+                    ):
+                        available = [d for d in available if d != developer_id]
+                    if debug:
+                        logger.debug(
+                            "task assigned task_id=%s estimation=%s developer_id=%s",
+                            task.id,
+                            task.estimation,
+                            developer_id,
+                        )
+                else:
+                    leftover_tasks.append(task)
+
+            # jeśli nie mamy danych na temat czasów tego konkretnego deva i tej estymacji, to
+            # zawsze dodajemy temu, kto ma najmniej estymacji
+            for developer_id, task in balance_leftover_tasks(
+                leftover_tasks,
+                developer_ids_in_specialization,
+                developer_total_estimation,
+                task_counts,
+                self.capacity,
+            ):
+                assignments.setdefault(developer_id, []).append(task)
+        return assignments
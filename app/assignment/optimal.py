@@ -0,0 +1,166 @@
+import math
+import numpy as np
+from .base import AssignmentStrategy, SPECIALIZATIONS
+
+
+def _positions(values, queries):
+    # indeks każdego elementu `queries` w `values` albo -1, jeśli go tam nie ma
+    values = np.asarray(values)
+    if len(values) == 0:
+        return np.full(len(queries), -1)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    index = np.clip(np.searchsorted(sorted_values, queries), 0, len(values) - 1)
+    return np.where(sorted_values[index] == queries, order[index], -1)
+
+
+def build_cost_matrix(developer_ids, estimations, completion_stats):
+    """Macierz (estymacja x developer) średnich czasów wykonania w sekundach.
+
+    Brakujące pary dostają średnią pozostałych developerów dla tej estymacji,
+    a estymacje bez żadnej historii - estymację razy średni czas na punkt.
+    """
+    counts = np.zeros((len(estimations), len(developer_ids)))
+    sums = np.zeros_like(counts)
+    known = [key for key in completion_stats if key[0] is not None]
+    if known:
+        keys = np.array(known, dtype=np.int64)
+        values = np.array([completion_stats[key] for key in known], dtype=np.float64)
+        rows = _positions(estimations, keys[:, 1])
+        cols = _positions(developer_ids, keys[:, 0])
+        mask = (rows >= 0) & (cols >= 0)
+        np.add.at(counts, (rows[mask], cols[mask]), values[mask, 0])
+        np.add.at(sums, (rows[mask], cols[mask]), values[mask, 1])
+
+    has_data = counts > 0
+    cost = np.divide(sums, counts, out=np.full_like(sums, np.nan), where=has_data)
+    row_known = has_data.sum(axis=1)
+    row_mean = np.divide(
+        np.where(has_data, cost, 0.0).sum(axis=1),
+        row_known,
+        out=np.zeros(len(estimations)),
+        where=row_known > 0,
+    )
+    points = (counts * np.asarray(estimations, dtype=np.float64)[:, None]).sum()
+    seconds_per_point = sums.sum() / points if points > 0 else 1.0
+    fallback = np.where(
+        row_known > 0,
+        row_mean,
+        np.asarray(estimations, dtype=np.float64) * seconds_per_point,
+    )
+    return np.where(has_data, cost, fallback[:, None])
+
+
+def solve_transportation(cost, supply, capacity):
+    """Przepływ o minimalnym koszcie z estymacji (po `supply` zadań) do developerów
+    (po `capacity` zadań), metodą kolejnych najkrótszych ścieżek.
+
+    Graf ma tylko len(supply) + len(capacity) wierzchołków, więc koszt nie zależy
+    od liczby zadań, a jedynie od liczby różnych estymacji i developerów.
+    Zwraca macierz liczby zadań danej estymacji przydzielonych developerowi.
+    """
+    n_rows, n_cols = cost.shape
+    # pełne sekundy - sumy na ścieżkach liczą się dokładnie, więc remisy przy
+    # porównaniach nie tworzą cykli w drzewie poprzedników
+    cost = np.rint(cost)
+    flow = np.zeros((n_rows, n_cols), dtype=np.int64)
+    supply = np.asarray(supply, dtype=np.int64).copy()
+    capacity = np.asarray(capacity, dtype=np.int64).copy()
+    all_cols = np.arange(n_cols)
+    all_rows = np.arange(n_rows)
+    while supply.sum() > 0 and capacity.sum() > 0:
+        # Bellman-Ford po grafie rezydualnym: źródło -> estymacja -> developer,
+        # plus krawędzie powrotne developer -> estymacja tam, gdzie już płynie przepływ.
+        # Poprzednik zmienia się tylko przy ścisłej poprawie odległości.
+        dist_row = np.where(supply > 0, 0.0, np.inf)
+        pred_row = np.full(n_rows, -1)
+        dist_col = np.full(n_cols, np.inf)
+        pred_col = np.full(n_cols, -1)
+        for _ in range(n_rows + n_cols + 1):
+            through = dist_row[:, None] + cost
+            best_row = through.argmin(axis=0)
+            candidate = through[best_row, all_cols]
+            improved_col = candidate < dist_col
+            dist_col = np.where(improved_col, candidate, dist_col)
+            pred_col = np.where(improved_col, best_row, pred_col)
+
+            back = np.where(flow > 0, dist_col[None, :] - cost, np.inf)
+            best_col = back.argmin(axis=1)
+            candidate = back[all_rows, best_col]
+            improved_row = candidate < dist_row
+            dist_row = np.where(improved_row, candidate, dist_row)
+            pred_row = np.where(improved_row, best_col, pred_row)
+            if not improved_col.any() and not improved_row.any():
+                break
+
+        end_dist = np.where(capacity > 0, dist_col, np.inf)
+        col = int(end_dist.argmin())
+        if not np.isfinite(end_dist[col]):
+            break
+        forward = []
+        backward = []
+        bottleneck = capacity[col]
+        while True:
+            row = int(pred_col[col])
+            forward.append((row, col))
+            if pred_row[row] == -1:
+                break
+            col = int(pred_row[row])
+            backward.append((row, col))
+            bottleneck = min(bottleneck, flow[row, col])
+        bottleneck = min(bottleneck, supply[row])
+
+        supply[row] -= bottleneck
+        capacity[forward[0][1]] -= bottleneck
+        for r, c in forward:
+            flow[r, c] += bottleneck
+        for r, c in backward:
+            flow[r, c] -= bottleneck
+    return flow
+
+
+class OptimalStrategy(AssignmentStrategy):
+    """Przydział minimalizujący łączny oczekiwany czas wykonania zadań.
+
+    Kosztem zadania u developera jest jego historyczny średni czas dla tej
+    estymacji. Każdy developer może dostać co najwyżej `capacity` zadań
+    (domyślnie tyle, żeby zadania specjalizacji rozłożyły się równo).
+    """
+
+    name = "optimal"
+
+    def plan(self, tasks, developers, completion_stats, loads=None):
+        loads = loads or {}
+        assignments = {}
+        for specialization in SPECIALIZATIONS:
+            developer_ids = [
+                d.id for d in developers if d.specialization == specialization
+            ]
+            tasks_by_estimation = {}
+            for task in tasks:
+                if task.specialization == specialization:
+                    tasks_by_estimation.setdefault(task.estimation, []).append(task)
+            if not developer_ids or not tasks_by_estimation:
+                continue
+
+            estimations = sorted(tasks_by_estimation)
+            supply = [len(tasks_by_estimation[e]) for e in estimations]
+            # zadania, które developerzy już mają, zajmują część ich limitu
+            taken = np.array([loads.get(d, (0, 0))[0] for d in developer_ids])
+            capacity = self.capacity or math.ceil(
+                (sum(supply) + taken.sum()) / len(developer_ids)
+            )
+            cost = build_cost_matrix(developer_ids, estimations, completion_stats)
+            flow = solve_transportation(cost, supply, np.maximum(capacity - taken, 0))
+
+            for row, estimation in enumerate(estimations):
+                queue = tasks_by_estimation[estimation]
+                start = 0
+                for col, developer_id in enumerate(developer_ids):
+                    count = int(flow[row, col])
+                    if count:
+                        assignments.setdefault(developer_id, []).extend(
+                            queue[start : start + count]
+                        )
+                        start += count
+        return assignments
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 30))
+
+
+class LRUCache:
+    """Słownik z limitem wpisów (wyrzuca najdawniej używane) i czasem życia wpisu.
+
+    Cache jest w pamięci procesu - przy kilku workerach unieważnienie dotyczy
+    tylko procesu, który zmienił dane, a pozostałe widzą zmianę po `ttl` sekundach.
+    Tego opóźnienia nie mają wpisy z wersją danych w kluczu (`project_developers`) -
+    po zmianie wersji w bazie stary wpis nie jest już odczytywany.
+    """
+
+    def __init__(self, name, maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys):
+        """Zwraca słownik z kluczami, które są w cache; reszta liczy się jako miss."""
+        found = {}
+        now = time.monotonic()
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is None or entry[0] < now:
+                    if entry is not None:
+                        del self.entries[key]
+                    self.misses += 1
+                    continue
+                self.entries.move_to_end(key)
+                self.hits += 1
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, values):
+        expires = time.monotonic() + self.ttl
+        with self.lock:
+            for key, value in values.items():
+                self.entries[key] = (expires, value)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "name": self.name,
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# developer_id -> schemas.Developer
+developers = LRUCache("developers")
+# (project_id, wersja projektu) -> krotka id developerów projektu
+project_developers = LRUCache("project_developers")
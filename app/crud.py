@@ -1,8 +1,128 @@
+from sqlalchemy import (
+    BigInteger,
+    and_,
+    delete,
+    false,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+from pydantic import ValidationError
 from fastapi import HTTPException
 from datetime import datetime
+import logging
+import time
+import base64
+import binascii
 from .database import SessionLocal
-from . import models, schemas
+from . import analytics, events, models, responses, schemas, cache
+from .assignment import get_strategy
+from .assignment.batch import AssignmentTask, plan_batch
+
+logger = logging.getLogger(__name__)
+
+
+# PAGINATION
+def encode_cursor(last_id: int):
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, id_column, skip: int = 0, limit: int = None, cursor: str = None):
+    """Strona wyników posortowana po id i kursor następnej strony (albo None).
+
+    Z kursorem strona zaczyna się od `id > ostatnie id`, co jest wyszukiwaniem
+    w indeksie klucza głównego zamiast przewijania `skip` wierszy. `skip` zostaje
+    dla zgodności. Bez `limit` zwraca wszystko.
+    """
+    query = query.order_by(id_column)
+    if cursor is not None:
+        query = query.filter(id_column > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].id)
+
+
+# HEALTH
+def check_database(db: Session):
+    db.execute(select(1))
+
+
+# CACHE
+def get_developers(db: Session, developer_ids):
+    """developer_id -> schemas.Developer dla istniejących developerów; brakujące
+    w cache są doczytywane jednym zapytaniem."""
+    found = cache.developers.get_many(developer_ids)
+    missing = [d for d in developer_ids if d not in found]
+    if missing:
+        loaded = {
+            developer.id: schemas.Developer.model_validate(
+                developer, from_attributes=True
+            )
+            for developer in db.query(models.Developer).filter(
+                models.Developer.id.in_(missing)
+            )
+        }
+        cache.developers.set_many(loaded)
+        found.update(loaded)
+    return found
+
+
+def get_project_developer_ids(db: Session, project_versions):
+    """project_id -> krotka id developerów projektu dla `project_versions`
+    (project_id -> wersja); brakujące w cache są doczytywane jednym zapytaniem.
+
+    Wpisy cache są kluczowane wersją projektu, więc skład zawsze pasuje do
+    wersji (i ETagu), którą wywołujący odczytał - podbicie wersji w dowolnym
+    procesie sprawia, że stary wpis przestaje być używany.
+    """
+    keys = list(project_versions.items())
+    found = {
+        project_id: developer_ids
+        for (project_id, _), developer_ids in cache.project_developers.get_many(
+            keys
+        ).items()
+    }
+    missing = [project_id for project_id, _ in keys if project_id not in found]
+    if missing:
+        loaded = {project_id: [] for project_id in missing}
+        rows = (
+            db.query(
+                models.ProjectDeveloper.project_id, models.ProjectDeveloper.developer_id
+            )
+            .filter(models.ProjectDeveloper.project_id.in_(missing))
+            .order_by(models.ProjectDeveloper.id)
+        )
+        for project_id, developer_id in rows:
+            loaded[project_id].append(developer_id)
+        loaded = {key: tuple(value) for key, value in loaded.items()}
+        cache.project_developers.set_many(
+            {
+                (project_id, project_versions[project_id]): developer_ids
+                for project_id, developer_ids in loaded.items()
+            }
+        )
+        found.update(loaded)
+    return found
 
 
 # DEVELOPER
@@ -15,16 +135,29 @@ def create_developer(db: Session, developer: schemas.DeveloperCreate):
 
 
 def read_developer(db: Session, id: int):
-    developer = db.query(models.Developer).filter(models.Developer.id == id).first()
+    developer = get_developers(db, [id]).get(id)
     if developer is None:
         raise HTTPException(status_code=404, detail="Developer not found")
     return developer
 
 
-def read_developers(db: Session, skip: int, limit: int):
-    developers = db.query(models.Developer).offset(skip).limit(limit).all()
+def read_developers_by_ids(db: Session, ids):
+    """Developerzy o podanych id w tej samej kolejności - z cache i jednym
+    zapytaniem IN dla reszty. 404 z listą wszystkich brakujących."""
+    found = get_developers(db, ids)
+    missing = [developer_id for developer_id in ids if developer_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Developers not found: {missing}")
+    return [found[developer_id] for developer_id in ids]
+
+
+def read_developers(db: Session, skip: int, limit: int, cursor: str = None):
+    developers, next_cursor = paginate(
+        db.query(models.Developer), models.Developer.id, skip, limit, cursor
+    )
     if len(developers) == 0:
         raise HTTPException(status_code=404, detail="No developers found")
+    return developers, next_cursor
 
 
 def update_developer(db: Session, id: int, developer: schemas.DeveloperUpdate):
@@ -37,46 +170,113 @@ def update_developer(db: Session, id: int, developer: schemas.DeveloperUpdate):
         setattr(existing_developer, field, value)
     db.add(existing_developer)
     db.commit()
+    cache.developers.invalidate(id)
     db.refresh(existing_developer)
     return existing_developer
 
 
+def read_developer_stats(db: Session, id: int, weeks: int):
+    if not get_developers(db, [id]):
+        raise HTTPException(status_code=404, detail="Developer not found")
+    return analytics.read_developer_stats(db, id, weeks)
+
+
 def delete_developer(db: Session, id: int):
+    project_ids = [
+        project_id
+        for (project_id,) in db.query(models.ProjectDeveloper.project_id).filter(
+            models.ProjectDeveloper.developer_id == id
+        )
+    ]
+    if project_ids:
+        bump_project_version(db, *project_ids)
+        events.record(
+            db,
+            [
+                events.new_event(
+                    schemas.TaskEventType.PROJECT_DEVELOPERS_CHANGED,
+                    project_id,
+                    added=[],
+                    removed=[id],
+                )
+                for project_id in project_ids
+            ],
+        )
     db.query(models.Developer).filter(models.Developer.id == id).delete()
     db.query(models.ProjectDeveloper).filter(
         models.ProjectDeveloper.developer_id == id
     ).delete()
     db.commit()
+    cache.developers.invalidate(id)
 
 
 # PROJECT
+def check_developers_exist(db: Session, developer_ids):
+    """Sprawdza wszystkie id naraz (cache i jedno zapytanie IN dla reszty) i zgłasza
+    400 z listą wszystkich brakujących."""
+    found = get_developers(db, developer_ids)
+    missing = [
+        developer_id for developer_id in developer_ids if developer_id not in found
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"All developers of the project must exist, missing: {missing}",
+        )
+
+
+def set_project_developers(db: Session, project_id: int, developer_ids, current=()):
+    """Zmienia skład projektu z `current` na `developer_ids` w bieżącej transakcji:
+    jedno DELETE dla usuniętych i jedno executemany dla dodanych, wiersze
+    developerów, którzy zostają, nie są ruszane."""
+    wanted = set(developer_ids)
+    removed = [developer_id for developer_id in current if developer_id not in wanted]
+    if removed:
+        db.execute(
+            delete(models.ProjectDeveloper)
+            .where(models.ProjectDeveloper.project_id == project_id)
+            .where(models.ProjectDeveloper.developer_id.in_(removed))
+        )
+    kept = set(current)
+    added = [
+        {"project_id": project_id, "developer_id": developer_id}
+        for developer_id in developer_ids
+        if developer_id not in kept
+    ]
+    if added:
+        db.execute(insert(models.ProjectDeveloper.__table__), added)
+    if removed or added:
+        events.record(
+            db,
+            [
+                events.new_event(
+                    schemas.TaskEventType.PROJECT_DEVELOPERS_CHANGED,
+                    project_id,
+                    added=[row["developer_id"] for row in added],
+                    removed=removed,
+                )
+            ],
+        )
+
+
 def create_project(db: Session, project: schemas.ProjectCreate):
+    # dict.fromkeys usuwa powtórzenia z zachowaniem kolejności
+    developer_ids = list(dict.fromkeys(project.developers))
+    check_developers_exist(db, developer_ids)
     new_project = models.Project(
         developer_owner_id=project.developer_owner_id, name=project.name
     )
     db.add(new_project)
     db.flush()
-    for developer_id in project.developers:
-        developer = (
-            db.query(models.Developer)
-            .filter(models.Developer.id == developer_id)
-            .first()
-        )
-        if developer is None:
-            raise HTTPException(
-                status_code=400, detail="All developers of the project must exist"
-            )
-        db.add(
-            models.ProjectDeveloper(
-                developer_id=developer.id, project_id=new_project.id
-            )
-        )
+    set_project_developers(db, new_project.id, developer_ids)
     db.commit()
+    # SQLite może nadać id usuniętego projektu - jego wpis miałby tę samą wersję
+    cache.project_developers.invalidate((new_project.id, 1))
     return {
         "id": new_project.id,
         "developer_owner_id": project.developer_owner_id,
         "name": project.name,
-        "developers": project.developers
+        "developers": developer_ids,
     }
 
 
@@ -89,41 +289,51 @@ def read_project(db: Session, id: int):
         "developer_owner_id": basic_info.developer_owner_id,
         "name": basic_info.name,
     }
-    developer_id_rows = (
-        db.query(models.ProjectDeveloper)
-        .filter(models.ProjectDeveloper.project_id == id)
-        .all()
+    response["developers"] = list(
+        get_project_developer_ids(db, {id: basic_info.version})[id]
     )
-    developer_ids = []
-    for row in developer_id_rows:
-        developer_ids.append(row.developer_id)
-        response["developers"] = developer_ids
-    response["developers"] = developer_ids
     return response
 
 
+def read_project_stats(db: Session, id: int, weeks: int):
+    if read_project_version(db, id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return analytics.read_project_stats(db, id, weeks)
+
+
 def read_project_developer(db: Session, developer_id: int):
-    project_id_rows = (
+    projects = (
         db.query(models.Project)
         .filter(models.Project.developer_owner_id == developer_id)
         .all()
     )
-    if len(project_id_rows) == 0:
+    if len(projects) == 0:
         raise HTTPException(status_code=404, detail="This developer has no projects")
-    response = []
-    for row in project_id_rows:
-        db = SessionLocal()
-        response.append(read_project(db=db, id=row.id))
-    return response
+    return build_projects_response(db, projects)
 
 
-def read_projects(db: Session, skip: int, limit: int):
-    projects_no_developers = db.query(models.Project).offset(skip).limit(limit).all()
-    response = []
-    for project in projects_no_developers:
-        db = SessionLocal()
-        response.append(read_project(db, project.id))
-    return response
+def read_projects(db: Session, skip: int, limit: int, cursor: str = None):
+    projects, next_cursor = paginate(
+        db.query(models.Project), models.Project.id, skip, limit, cursor
+    )
+    return build_projects_response(db, projects), next_cursor
+
+
+def build_projects_response(db: Session, projects):
+    # developerzy wszystkich projektów z cache, brakujący jednym zapytaniem
+    developer_ids = get_project_developer_ids(
+        db, {project.id: project.version for project in projects}
+    )
+    # kolejność pól jak w schemas.Project - lista idzie też prosto do orjson
+    return [
+        {
+            "id": project.id,
+            "name": project.name,
+            "developer_owner_id": project.developer_owner_id,
+            "developers": list(developer_ids[project.id]),
+        }
+        for project in projects
+    ]
 
 
 def update_project(db: Session, project_id: int, project: schemas.ProjectUpdate):
@@ -132,21 +342,47 @@ def update_project(db: Session, project_id: int, project: schemas.ProjectUpdate)
     )
     if existing_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    for field, value in project.model_dump(exclude_unset=True).items():
+    for field, value in project.model_dump(
+        exclude_unset=True, exclude={"developers"}
+    ).items():
         setattr(existing_project, field, value)
-    db.query(models.ProjectDeveloper).filter(
-        models.ProjectDeveloper.project_id == project_id
-    ).delete()
-    for developer_id in project.developers:
-        new_entry = models.ProjectDeveloper(
-            developer_id=developer_id, project_id=project_id
-        )
-        db.add(new_entry)
+    if project.developers is not None:
+        developer_ids = list(dict.fromkeys(project.developers))
+        check_developers_exist(db, developer_ids)
+        # obecny skład prosto z bazy, nie z cache - różnica musi być dokładna
+        current = [
+            developer_id
+            for (developer_id,) in db.query(
+                models.ProjectDeveloper.developer_id
+            ).filter(models.ProjectDeveloper.project_id == project_id)
+        ]
+        set_project_developers(db, project_id, developer_ids, current)
+    # wyrażenie SQL, a nie wartość z Pythona - nie gubi równoległych podbić
+    existing_project.version = models.Project.version + 1
     db.add(existing_project)
     db.commit()
 
 
 def delete_project(db: Session, id: int):
+    removed = [
+        developer_id
+        for (developer_id,) in db.query(models.ProjectDeveloper.developer_id)
+        .filter(models.ProjectDeveloper.project_id == id)
+        .order_by(models.ProjectDeveloper.id)
+    ]
+    if removed:
+        # jak przy usunięciu developera - obserwator projektu widzi, że skład zniknął
+        events.record(
+            db,
+            [
+                events.new_event(
+                    schemas.TaskEventType.PROJECT_DEVELOPERS_CHANGED,
+                    id,
+                    added=[],
+                    removed=removed,
+                )
+            ],
+        )
     db.query(models.Project).filter(models.Project.id == id).delete()
     db.query(models.ProjectDeveloper).filter(
         models.ProjectDeveloper.project_id == id
@@ -154,14 +390,35 @@ def delete_project(db: Session, id: int):
     db.commit()
 
 
+def read_project_version(db: Session, project_id: int):
+    """Wersja projektu albo None, jeśli projektu nie ma - jedno zapytanie po
+    kluczu głównym, bez ładowania tasków ani przydziałów."""
+    return db.execute(
+        select(models.Project.version).where(models.Project.id == project_id)
+    ).scalar()
+
+
+def bump_project_version(db: Session, *project_ids):
+    """Podbija wersję projektów w bieżącej transakcji - commit robi wywołujący."""
+    db.execute(
+        update(models.Project)
+        .where(models.Project.id.in_(project_ids))
+        .values(version=models.Project.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
 # TASK
 def create_task(db: Session, project_id: int, task: schemas.TaskCreate):
+    # walidator zamienia estymację 0 i 1 na True, a baza zapisuje 1 - zdarzenie
+    # i agregaty mają dostać to, co jest w wierszu
+    estimation = int(task.estimation)
     if task.developer_id:  # jeśli przypisano kogoś do taska
         new_task = models.Task(
             name=task.name,
             project_id=project_id,
             state="IN_PROGRESS",
-            estimation=task.estimation,
+            estimation=estimation,
             specialization=task.specialization,
             developer_id=task.developer_id,
             datetime_assigned=datetime.utcnow(),
@@ -170,15 +427,124 @@ def create_task(db: Session, project_id: int, task: schemas.TaskCreate):
         new_task = models.Task(
             name=task.name,
             project_id=project_id,
-            estimation=task.estimation,
+            estimation=estimation,
             specialization=task.specialization,
         )
     db.add(new_task)
+    # flush uzupełnia domyślne wartości kolumn (np. stan) przed liczeniem agregatów
+    db.flush()
+    analytics.apply(db, added=[analytics.snapshot(new_task)])
+    events.record(
+        db,
+        [
+            events.new_event(
+                schemas.TaskEventType.TASK_CREATED,
+                project_id,
+                new_task.id,
+                task=events.task_data(new_task),
+            )
+        ],
+    )
+    bump_project_version(db, project_id)
     db.commit()
     db.refresh(new_task)
     return new_task
 
 
+BULK_TASK_CHUNK_SIZE = 5000
+
+
+def bulk_create_tasks(db: Session, project_id: int, items: list):
+    """Tworzy wiele tasków naraz. `items` to surowe słowniki (albo błędy parsowania
+    jako wyjątki); każdy kawałek po BULK_TASK_CHUNK_SIZE pozycji jest wstawiany
+    przez executemany w osobnej transakcji. Zwraca id albo błąd dla każdej pozycji;
+    id rosną w kolejności pozycji.
+
+    Każdy kawałek zapisuje jedno zdarzenie `tasks.created` z listą id zamiast
+    zdarzenia z pełnymi polami dla każdego taska - pola czyta się z API."""
+    start = time.perf_counter()
+    results = []
+    # executemany na tabeli (Core) zamiast przez ORM - bez narzutu na obiekty modelu
+    table = models.Task.__table__
+    for chunk_start in range(0, len(items), BULK_TASK_CHUNK_SIZE):
+        # wiersze w kolejności wejścia i z tymi samymi kluczami - cały kawałek
+        # idzie jednym executemany, a id wracają w tej samej kolejności
+        rows = []
+        row_results = []
+        chunk_end = min(chunk_start + BULK_TASK_CHUNK_SIZE, len(items))
+        for index in range(chunk_start, chunk_end):
+            item = items[index]
+            try:
+                if isinstance(item, Exception):
+                    raise item
+                task = schemas.TaskCreate.model_validate(item)
+            except ValidationError as e:
+                error = e.errors()[0]
+                location = ".".join(str(part) for part in error["loc"])
+                message = f"{location}: {error['msg']}" if location else error["msg"]
+                results.append({"index": index, "error": message})
+                continue
+            except ValueError as e:
+                results.append({"index": index, "error": str(e)})
+                continue
+            row = {
+                "name": task.name,
+                "project_id": project_id,
+                "estimation": int(task.estimation),  # jak w create_task
+                "specialization": task.specialization.value,
+                "state": "NOT_ASSIGNED",
+                "developer_id": None,
+                "datetime_assigned": None,
+            }
+            if task.developer_id:  # tak jak w create_task
+                row["state"] = "IN_PROGRESS"
+                row["developer_id"] = task.developer_id
+                row["datetime_assigned"] = datetime.utcnow()
+            result = {"index": index}
+            results.append(result)
+            rows.append(row)
+            row_results.append(result)
+        if rows:
+            # id z RETURNING paczkami (insertmanyvalues), więc należą do tych
+            # wierszy także przy równoległych zapisach
+            if db.get_bind().dialect.name == "sqlite":
+                # SQLAlchemy nie ma dla SQLite znacznika kolejności wierszy i z
+                # sort_by_parameter_order wysyła wiersz po wierszu. SQLite nadaje
+                # rowid kolejnym wierszom VALUES rosnąco, a paczki idą po kolei,
+                # więc posortowane id są w kolejności wejścia
+                ids = sorted(
+                    db.execute(insert(table).returning(table.c.id), rows).scalars()
+                )
+            else:
+                ids = db.execute(
+                    insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                    rows,
+                ).scalars()
+            for result, task_id in zip(row_results, ids):
+                result["id"] = task_id
+            analytics.apply(db, added=[analytics.snapshot(row) for row in rows])
+            events.record(
+                db,
+                [
+                    events.new_event(
+                        schemas.TaskEventType.TASKS_CREATED,
+                        project_id,
+                        task_ids=[result["id"] for result in row_results],
+                    )
+                ],
+            )
+            bump_project_version(db, project_id)
+        db.commit()
+    elapsed = time.perf_counter() - start
+    created = sum(1 for result in results if "id" in result)
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "tasks_per_second": created / elapsed if elapsed > 0 else 0.0,
+        "results": results,
+    }
+
+
 def read_task(db: Session, project_id: int, task_id: int):
     return (
         db.query(models.Task)
@@ -188,8 +554,73 @@ def read_task(db: Session, project_id: int, task_id: int):
     )
 
 
-def read_project_tasks(db: Session, project_id: int):
-    return db.query(models.Task).filter(models.Task.project_id == project_id).all()
+# kolumny odpowiedzi z taskami (app.responses) - bez obiektów modelu
+TASK_RESPONSE_COLUMNS = responses.schema_columns(schemas.Task, models.Task)
+
+
+def read_project_tasks(
+    db: Session, project_id: int, limit: int = None, cursor: str = None
+):
+    """Strona tasków projektu jako słowniki z polami schemas.Task."""
+    rows, next_cursor = paginate(
+        db.query(*TASK_RESPONSE_COLUMNS).filter(models.Task.project_id == project_id),
+        models.Task.id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return responses.rows_to_dicts(rows, TASK_RESPONSE_COLUMNS), next_cursor
+
+
+# id w jednym zapytaniu IN - SQLite ma limit parametrów zapytania
+READ_IDS_CHUNK_SIZE = 5000
+
+
+def get_tasks(db: Session, task_ids, project_id: int = None):
+    """task_id -> task dla istniejących tasków (z `project_id` tylko z tego
+    projektu), jedno zapytanie IN na READ_IDS_CHUNK_SIZE id."""
+    task_ids = list(task_ids)
+    found = {}
+    for start in range(0, len(task_ids), READ_IDS_CHUNK_SIZE):
+        query = db.query(models.Task).filter(
+            models.Task.id.in_(task_ids[start : start + READ_IDS_CHUNK_SIZE])
+        )
+        if project_id is not None:
+            query = query.filter(models.Task.project_id == project_id)
+        found.update((task.id, task) for task in query)
+    return found
+
+
+def read_tasks_by_ids(db: Session, project_id: int, ids):
+    """Taski projektu o podanych id w tej samej kolejności. 404 z listą
+    wszystkich brakujących (także tych z innych projektów)."""
+    found = get_tasks(db, ids, project_id)
+    missing = [task_id for task_id in ids if task_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tasks not found: {missing}")
+    return [found[task_id] for task_id in ids]
+
+
+STREAM_CHUNK_SIZE = 1000
+
+
+def stream_project_tasks(project_id: int):
+    """Taski projektu jako kawałki NDJSON (po STREAM_CHUNK_SIZE linii).
+
+    Generator ma własną sesję, bo żyje dłużej niż zależność `get_db` requestu.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(*TASK_RESPONSE_COLUMNS)
+            .where(models.Task.project_id == project_id)
+            .order_by(models.Task.id)
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        for chunk in rows.partitions():
+            tasks = responses.rows_to_dicts(chunk, TASK_RESPONSE_COLUMNS)
+            yield b"".join(responses.dumps(task) + b"\n" for task in tasks)
+    finally:
+        db.close()
 
 
 def update_task(db: Session, project_id: int, task_id: int, task: schemas.TaskUpdate):
@@ -202,112 +633,106 @@ def update_task(db: Session, project_id: int, task_id: int, task: schemas.TaskUp
     if existing_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    for field, value in task.model_dump(exclude_unset=True).items():
+    before = analytics.snapshot(existing_task)
+    changes = task.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(existing_task, field, value)
     db.add(existing_task)
+    analytics.apply(db, removed=[before], added=[analytics.snapshot(existing_task)])
+    data = events.task_data(existing_task)
+    if existing_task.project_id == project_id:
+        task_events = [
+            events.new_event(
+                schemas.TaskEventType.TASK_UPDATED,
+                project_id,
+                task_id,
+                task=data,
+                changed=sorted(changes),
+            )
+        ]
+    else:
+        # przeniesienie - obserwator każdego z projektów widzi je u siebie
+        task_events = [
+            events.new_event(
+                schemas.TaskEventType.TASK_DELETED,
+                project_id,
+                task_id,
+                moved_to=existing_task.project_id,
+            ),
+            events.new_event(
+                schemas.TaskEventType.TASK_CREATED,
+                existing_task.project_id,
+                task_id,
+                task=data,
+                moved_from=project_id,
+            ),
+        ]
+    events.record(db, task_events)
+    # przy przeniesieniu zmieniają się oba projekty
+    bump_project_version(db, project_id, existing_task.project_id)
     db.commit()
     db.refresh(existing_task)
     return existing_task
 
 
 def delete_task(db: Session, project_id: int, task_id: int):
+    removed = db.execute(
+        select(*analytics.TASK_COLUMNS)
+        .where(models.Task.id == task_id)
+        .where(models.Task.project_id == project_id)
+    ).all()
+    analytics.apply(db, removed=[analytics.snapshot(task) for task in removed])
+    if removed:
+        events.record(
+            db,
+            [events.new_event(schemas.TaskEventType.TASK_DELETED, project_id, task_id)],
+        )
     db.query(models.Task).filter(models.Task.id == task_id).filter(
         models.Task.project_id == project_id
     ).delete()
+    bump_project_version(db, project_id)
     db.commit()
 
 
 # ASSIGNMENT
-def create_assignment(db: Session, project_id: int):
-    all_project_tasks = (
-        db.query(models.Task).filter(models.Task.project_id == project_id).all()
-    )
-    completed_project_tasks = [
-        task for task in all_project_tasks if task.state == "CLOSED"
-    ]
-    uncompleted_project_tasks = [
-        task for task in all_project_tasks if task.state == "NOT_ASSIGNED"
-    ]
+def create_assignment(
+    db: Session,
+    project_id: int,
+    strategy: str = "greedy",
+    capacity: int = None,
+    incremental: bool = False,
+):
+    """Nowy przydział dla tasków NOT_ASSIGNED. Z `incremental` przeplanowuje
+    ostatni niezaakceptowany przydział projektu (`replan_assignment`), a dopiero
+    gdy takiego nie ma, liczy nowy."""
+    # stan sprzed odczytu - zmiany w trakcie planowania złapie następne przeplanowanie
+    planned_at = datetime.utcnow()
+    if incremental:
+        pending = (
+            db.query(models.Assignment)
+            .filter(models.Assignment.project_id == project_id)
+            .filter(models.Assignment.accepted.is_(None))
+            .order_by(models.Assignment.id.desc())
+            .first()
+        )
+        if pending is not None:
+            return replan_assignment(db, pending, planned_at, strategy, capacity)
+    uncompleted_project_tasks = read_assignment_tasks(db, project_id)
     if not uncompleted_project_tasks:
         raise HTTPException(
             status_code=400, detail="There are no tasks with state NOT_ASSIGNED"
         )
-    developer_ids_query = (
-        db.query(models.ProjectDeveloper)
-        .filter(models.ProjectDeveloper.project_id == project_id)
-        .all()
+    developer_ids = get_project_developer_ids(
+        db, {project_id: read_project_version(db, project_id)}
+    )[project_id]
+    # po id, tak jak zwracało je wcześniej zapytanie IN - kolejność rozstrzyga remisy
+    developers = sorted(get_developers(db, developer_ids).values(), key=lambda d: d.id)
+    planner = get_strategy(strategy, capacity=capacity)
+    assignments = planner.plan(
+        uncompleted_project_tasks,
+        developers,
+        read_completion_stats(db, [project_id]).get(project_id, {}),
     )
-    developer_ids = [row.developer_id for row in developer_ids_query]
-    developers = (
-        db.query(models.Developer).filter(models.Developer.id.in_(developer_ids)).all()
-    )
-    assignments = {}
-    for d_id in developer_ids:
-        assignments[d_id] = []
-
-    def find_fastest_developer(developer_ids, estimation):
-        average = 99999999
-        fastest_developer_id = -1
-        for dev_id in developer_ids:
-            sum_seconds = 0
-            developer_tasks_estimation = []
-            for t in completed_project_tasks:
-                if t.developer_id == dev_id and t.estimation == estimation:
-                    developer_tasks_estimation.append(t)
-            if len(developer_tasks_estimation) == 0:
-                print(f"NO DATA FOR DEV {dev_id} ESTIMATION {estimation} ")
-                continue
-            for task in developer_tasks_estimation:
-                sum_seconds += (
-                    task.datetime_completed - task.datetime_assigned
-                ).total_seconds()
-            current_average = sum_seconds / len(developer_tasks_estimation)
-            print(
-                f"DEV {dev_id} FOR ESTIMATION {estimation} AVERAGE TIME {current_average}"
-            )
-            if current_average < average:
-                average = current_average
-                fastest_developer_id = dev_id
-        return fastest_developer_id
-
-    for specialization in ["FRONTEND", "BACKEND", "UX/UI", "DEVOPS"]:
-        print(f"SPECIALIZATION {specialization}")
-        developer_ids_in_specialization = [
-            d.id for d in developers if d.specialization == specialization
-        ]
-        tasks_in_specialization = [
-            t for t in uncompleted_project_tasks if t.specialization == specialization
-        ]
-        leftover_tasks = []
-        developer_total_estimation = {}
-        for d in developer_ids_in_specialization:
-            developer_total_estimation[d] = 0
-
-        for task in tasks_in_specialization:
-            print(f"TASK {task.id} ESTIMATION {task.estimation}")
-            print(f"DEVELOPERS: {[i for i in developer_ids_in_specialization ]}")
-            # szukamy najszybszego historyczne deva do takiego zadania
-            developer_id = find_fastest_developer(
-                developer_ids_in_specialization, task.estimation
-            )
-            if developer_id != -1:
-                assignments[developer_id].append(task)
-                developer_total_estimation[developer_id] += task.estimation
-                print(f"ASSIGNING TASK {task.id} TO DEV {developer_id}")
-            else:
-                leftover_tasks.append(task)
-
-        # jeśli nie mamy danych na temat czasów tego konkretnego deva i tej estymacji, to
-        # zawsze dodajemy temu, kto ma najmniej estymacji
-        if leftover_tasks:
-            while len(leftover_tasks) > 0:
-                task = leftover_tasks.pop()
-                for developer_id in developer_ids_in_specialization:
-                    if developer_total_estimation[developer_id] == min(
-                        developer_total_estimation.values()
-                    ):
-                        assignments[developer_id].append(task)
-                        break
 
     response = {}
     response["changes"] = {}
@@ -316,21 +741,480 @@ def create_assignment(db: Session, project_id: int):
     for key, value in assignments.items():
         for task in value:
             response["changes"][key].append(task.id)
-    assignment = models.Assignment(project_id=project_id)
+    assignment = models.Assignment(project_id=project_id, planned_at=planned_at)
     db.add(assignment)
     db.flush()
     response["id"] = assignment.id
-    for developer_id, task_ids in response["changes"].items():
-        for task_id in task_ids:
-            change = models.ProposedChange(
-                developer_id=developer_id, task_id=task_id, assignment_id=assignment.id
-            )
-            db.add(change)
+    insert_proposed_changes(db, assignment.id, response["changes"])
+    bump_project_version(db, project_id)
     db.commit()
     return response
 
 
-def read_assignment(db: Session, project_id: int, assignment_id: int):
+def create_assignments_batch(
+    db: Session,
+    project_ids: list = None,
+    strategy: str = "optimal",
+    capacity: int = None,
+):
+    """Nowe przydziały dla wielu projektów naraz (bez `project_ids` - dla
+    wszystkich), po jednym na projekt z taskami NOT_ASSIGNED.
+
+    Taski, składy i developerzy są ładowani kilkoma zapytaniami dla wszystkich
+    projektów, a planowanie idzie przez `plan_batch` - obciążenie developera
+    jest wspólne dla projektów, w których jest. Domyślna strategia to
+    optimal: jej limit zadań obejmuje to, co developer dostał w poprzednich
+    projektach; greedy bierze to pod uwagę tylko z `capacity`. Projekty bez
+    tasków do przydzielenia trafiają do `skipped_project_ids`.
+    """
+    planned_at = datetime.utcnow()
+    # wersje od razu z id - po nich jest skład projektów w cache
+    if project_ids is None:
+        versions = dict(
+            db.execute(select(models.Project.id, models.Project.version)).all()
+        )
+        project_ids = list(versions)
+    else:
+        project_ids = list(dict.fromkeys(project_ids))
+        versions = dict(
+            db.execute(
+                select(models.Project.id, models.Project.version).where(
+                    models.Project.id.in_(project_ids)
+                )
+            ).all()
+        )
+        missing = [
+            project_id for project_id in project_ids if project_id not in versions
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=404, detail=f"Projects not found: {missing}"
+            )
+
+    tasks = {project_id: [] for project_id in project_ids}
+    rows = (
+        db.query(
+            models.Task.project_id,
+            models.Task.id,
+            models.Task.estimation,
+            models.Task.specialization,
+        )
+        .filter(models.Task.project_id.in_(project_ids))
+        .filter(models.Task.state == "NOT_ASSIGNED")
+        .order_by(models.Task.id)
+    )
+    for task in rows:
+        tasks[task.project_id].append(
+            AssignmentTask(task.id, task.estimation, task.specialization)
+        )
+    skipped = [project_id for project_id in project_ids if not tasks[project_id]]
+    planned_ids = [project_id for project_id in project_ids if tasks[project_id]]
+
+    project_developer_ids = get_project_developer_ids(
+        db, {project_id: versions[project_id] for project_id in planned_ids}
+    )
+    developers = get_developers(
+        db,
+        list({d for p in planned_ids for d in project_developer_ids[p]}),
+    )
+    # przypisania do nieistniejących developerów są pomijane, jak w create_assignment
+    project_developer_ids = {
+        project_id: [d for d in developer_ids if d in developers]
+        for project_id, developer_ids in project_developer_ids.items()
+    }
+    completion_stats = read_completion_stats(db, planned_ids)
+    projects = [
+        (
+            project_id,
+            tasks[project_id],
+            sorted(
+                (developers[d] for d in project_developer_ids[project_id]),
+                key=lambda d: d.id,
+            ),
+            completion_stats.get(project_id, {}),
+        )
+        for project_id in planned_ids
+    ]
+    planned = plan_batch(strategy, capacity, projects, project_developer_ids)
+
+    response = []
+    if planned_ids:
+        assignment_ids = dict(
+            db.execute(
+                insert(models.Assignment.__table__).returning(
+                    models.Assignment.project_id, models.Assignment.id
+                ),
+                [
+                    {"project_id": project_id, "planned_at": planned_at}
+                    for project_id in planned_ids
+                ],
+            ).all()
+        )
+        rows = []
+        for project_id in planned_ids:
+            changes = {int(d): [] for d in project_developer_ids[project_id]}
+            changes.update(planned[project_id])
+            response.append(
+                {
+                    "id": assignment_ids[project_id],
+                    "project_id": project_id,
+                    "accepted": None,
+                    "changes": changes,
+                }
+            )
+            rows.extend(
+                {
+                    "assignment_id": assignment_ids[project_id],
+                    "developer_id": developer_id,
+                    "task_id": task_id,
+                }
+                for developer_id, task_ids in changes.items()
+                for task_id in task_ids
+            )
+        if rows:
+            db.execute(insert(models.ProposedChange.__table__), rows)
+        bump_project_version(db, *planned_ids)
+        db.commit()
+    return {"assignments": response, "skipped_project_ids": skipped}
+
+
+def read_assignment_tasks(db: Session, project_id: int):
+    # taski do przydzielenia po id - kolejność rozstrzyga remisy; same kolumny
+    # zamiast obiektów modelu - bez ich budowania i wygaszania w commicie
+    return (
+        db.query(models.Task.id, models.Task.estimation, models.Task.specialization)
+        .filter(models.Task.project_id == project_id)
+        .filter(models.Task.state == "NOT_ASSIGNED")
+        .order_by(models.Task.id)
+        .all()
+    )
+
+
+class duration_microseconds(FunctionElement):
+    """Mikrosekundy od pierwszej do drugiej daty, liczone w bazie jako liczba
+    całkowita - suma w GROUP BY jest dokładna jak w Pythonie."""
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(duration_microseconds)
+def compile_duration_microseconds(element, compiler, **kw):
+    # SQLite trzyma daty jako tekst "RRRR-MM-DD GG:MM:SS.ffffff". julianday i
+    # strftime liczą tylko z dokładnością do milisekundy (i zaokrąglają sekundę),
+    # więc pełne sekundy są z pierwszych 19 znaków, a mikrosekundy z reszty
+    # tekstu (brakujące cyfry to zera)
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+
+    def microseconds(value):
+        return (
+            f"CAST(strftime('%s', substr({value}, 1, 19)) AS INTEGER) * 1000000"
+            f" + CAST(substr({value} || '000000', 21, 6) AS INTEGER)"
+        )
+
+    return f"(({microseconds(end)}) - ({microseconds(start)}))"
+
+
+@compiles(duration_microseconds, "postgresql")
+def compile_duration_microseconds_postgresql(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"CAST(EXTRACT(EPOCH FROM {end} - {start}) * 1000000 AS BIGINT)"
+
+
+def read_completion_stats(db: Session, project_ids, estimations=None):
+    """project_id -> statystyki ukończeń z zamkniętych tasków projektów,
+    (developer_id, estymacja) -> [liczba zadań, suma sekund], opcjonalnie tylko
+    dla `estimations`. Projekty bez historii nie mają wpisu.
+
+    Liczba i suma czasów są grupowane w bazie, więc do Pythona przychodzi
+    wiersz na (projekt, developer, estymacja), a nie na każdy task historii."""
+    query = (
+        select(
+            models.Task.project_id,
+            models.Task.developer_id,
+            models.Task.estimation,
+            func.count(),
+            func.sum(
+                duration_microseconds(
+                    models.Task.datetime_assigned, models.Task.datetime_completed
+                )
+            ),
+        )
+        .where(models.Task.project_id.in_(project_ids))
+        .where(models.Task.state == "CLOSED")
+        # zamknięty task bez developera albo dat nic nie mówi o czasie pracy
+        .where(models.Task.developer_id.is_not(None))
+        .where(models.Task.datetime_assigned.is_not(None))
+        .where(models.Task.datetime_completed.is_not(None))
+        .group_by(
+            models.Task.project_id, models.Task.developer_id, models.Task.estimation
+        )
+    )
+    if estimations is not None:
+        query = query.where(models.Task.estimation.in_(estimations))
+    stats = {}
+    for project_id, developer_id, estimation, count, microseconds in db.execute(query):
+        stats.setdefault(project_id, {})[(developer_id, estimation)] = [
+            count,
+            microseconds / 1000000,
+        ]
+    return stats
+
+
+def insert_proposed_changes(db: Session, assignment_id: int, changes):
+    """Zapisuje propozycje (developer_id -> lista id tasków) jednym executemany."""
+    rows = [
+        {
+            "assignment_id": assignment_id,
+            "developer_id": developer_id,
+            "task_id": task_id,
+        }
+        for developer_id, task_ids in changes.items()
+        for task_id in task_ids
+    ]
+    if rows:
+        db.execute(insert(models.ProposedChange.__table__), rows)
+
+
+def replan_assignment(
+    db: Session,
+    assignment: models.Assignment,
+    planned_at: datetime,
+    strategy: str = "greedy",
+    capacity: int = None,
+):
+    """Przeplanowuje niezaakceptowany przydział, zmieniając tylko to, na co
+    wpłynęły zmiany od `assignment.planned_at`.
+
+    Propozycja zostaje, jeśli jej task jest nadal NOT_ASSIGNED i się nie zmienił,
+    developer jest w projekcie z tą samą specjalizacją, a statystyki dla
+    (specjalizacja, estymacja) taska się nie zmieniły - nikt z tej specjalizacji
+    nie zamknął od tamtej pory taska o tej estymacji i nie dołączył do projektu
+    nikt z historią dla niej. Pozostałe taski (też nowe) idą do strategii razem
+    z obciążeniem z zachowanych propozycji; zapisywana jest tylko różnica.
+    Wybór tasków do przeplanowania i obciążenie liczy baza, więc z bazy
+    przychodzą tylko zmienione taski i historia dla ich estymacji.
+
+    Wynik może się różnić od liczenia od zera, bo zachowane propozycje się nie
+    przesuwają. Zmiana specjalizacji developera bez propozycji nie jest
+    zauważana - wtedy pomaga nowy przydział bez `incremental`.
+    """
+    project_id = assignment.project_id
+    since = assignment.planned_at
+    developer_ids = get_project_developer_ids(
+        db, {project_id: read_project_version(db, project_id)}
+    )[project_id]
+    developers = sorted(get_developers(db, developer_ids).values(), key=lambda d: d.id)
+    specialization = {d.id: d.specialization.value for d in developers}
+
+    if since is None:
+        # przydział sprzed zapisywania planned_at - przeplanowujemy wszystko
+        replan_condition = true()
+    else:
+        # (specjalizacja, estymacja) ze zmienionymi statystykami: nowo zamknięte
+        # taski i historia developerów, którzy dołączyli do projektu
+        dirty_keys = set()
+        changed_history = (
+            db.query(models.Task.developer_id, models.Task.estimation)
+            .distinct()
+            .outerjoin(
+                models.ProjectDeveloper,
+                and_(
+                    models.ProjectDeveloper.project_id == project_id,
+                    models.ProjectDeveloper.developer_id == models.Task.developer_id,
+                ),
+            )
+            .filter(models.Task.project_id == project_id)
+            .filter(models.Task.state == "CLOSED")
+            .filter(
+                or_(
+                    models.Task.updated_at > since,
+                    models.ProjectDeveloper.created_at > since,
+                )
+            )
+        )
+        for developer_id, estimation in changed_history:
+            if developer_id in specialization:
+                dirty_keys.add((specialization[developer_id], estimation))
+        replan_condition = or_(
+            models.ProposedChange.id.is_(None),
+            models.Task.updated_at > since,
+            models.ProjectDeveloper.id.is_(None),
+            models.Developer.specialization != models.Task.specialization,
+            (
+                tuple_(models.Task.specialization, models.Task.estimation).in_(
+                    dirty_keys
+                )
+                if dirty_keys
+                else false()
+            ),
+        )
+
+    # taski do przeplanowania razem z ich dotychczasową propozycją (jeśli była)
+    replanned = (
+        db.query(
+            models.Task.id,
+            models.Task.estimation,
+            models.Task.specialization,
+            models.ProposedChange.id.label("change_id"),
+            models.ProposedChange.developer_id.label("proposed_developer_id"),
+        )
+        .outerjoin(
+            models.ProposedChange,
+            and_(
+                models.ProposedChange.assignment_id == assignment.id,
+                models.ProposedChange.task_id == models.Task.id,
+            ),
+        )
+        .outerjoin(
+            models.ProjectDeveloper,
+            and_(
+                models.ProjectDeveloper.project_id == project_id,
+                models.ProjectDeveloper.developer_id
+                == models.ProposedChange.developer_id,
+            ),
+        )
+        .outerjoin(
+            models.Developer, models.Developer.id == models.ProposedChange.developer_id
+        )
+        .filter(models.Task.project_id == project_id)
+        .filter(models.Task.state == "NOT_ASSIGNED")
+        .filter(replan_condition)
+        .order_by(models.Task.id)
+        .all()
+    )
+    # propozycje tasków, które nie są już NOT_ASSIGNED w tym projekcie (albo usunięte)
+    dropped = [
+        change_id
+        for (change_id,) in db.query(models.ProposedChange.id)
+        .outerjoin(
+            models.Task,
+            and_(
+                models.Task.id == models.ProposedChange.task_id,
+                models.Task.project_id == project_id,
+                models.Task.state == "NOT_ASSIGNED",
+            ),
+        )
+        .filter(models.ProposedChange.assignment_id == assignment.id)
+        .filter(models.Task.id.is_(None))
+    ]
+
+    # obciążenie z propozycji, które zostają
+    loads = {}
+    proposal_loads = (
+        db.query(
+            models.ProposedChange.developer_id,
+            func.count(),
+            func.sum(models.Task.estimation),
+        )
+        .join(models.Task, models.Task.id == models.ProposedChange.task_id)
+        .filter(models.ProposedChange.assignment_id == assignment.id)
+        .filter(models.Task.project_id == project_id)
+        .filter(models.Task.state == "NOT_ASSIGNED")
+        .group_by(models.ProposedChange.developer_id)
+    )
+    for developer_id, count, estimation_sum in proposal_loads:
+        loads[developer_id] = [count, estimation_sum]
+    for task in replanned:
+        if task.change_id is not None:
+            load = loads[task.proposed_developer_id]
+            load[0] -= 1
+            load[1] -= task.estimation
+
+    planned = {}
+    if replanned:
+        # historia tylko dla estymacji przeplanowywanych tasków - strategie nie
+        # sięgają po inne
+        completion_stats = read_completion_stats(
+            db, [project_id], {t.estimation for t in replanned}
+        ).get(project_id, {})
+        planner = get_strategy(strategy, capacity=capacity)
+        assignments = planner.plan(
+            replanned,
+            developers,
+            completion_stats,
+            loads,
+        )
+        planned = {
+            task.id: developer_id
+            for developer_id, tasks in assignments.items()
+            for task in tasks
+        }
+    # propozycje, które po przeplanowaniu są takie same, zostają w bazie
+    for task in replanned:
+        if task.change_id is None:
+            continue
+        if planned.get(task.id) == task.proposed_developer_id:
+            del planned[task.id]
+        else:
+            dropped.append(task.change_id)
+    added = {}
+    for task_id, developer_id in planned.items():
+        added.setdefault(developer_id, []).append(task_id)
+    if dropped:
+        db.execute(
+            delete(models.ProposedChange).where(models.ProposedChange.id.in_(dropped))
+        )
+    insert_proposed_changes(db, assignment.id, added)
+    assignment.planned_at = planned_at
+    if dropped or added:
+        bump_project_version(db, project_id)
+    changes = {int(developer_id): [] for developer_id in developer_ids}
+    for developer_id, task_id in (
+        db.query(models.ProposedChange.developer_id, models.ProposedChange.task_id)
+        .filter(models.ProposedChange.assignment_id == assignment.id)
+        .order_by(models.ProposedChange.task_id)
+    ):
+        changes.setdefault(developer_id, []).append(task_id)
+    db.commit()
+    logger.debug(
+        "assignment replanned assignment_id=%s replanned=%s dropped=%s added=%s",
+        assignment.id,
+        len(replanned),
+        len(dropped),
+        len(planned),
+    )
+    return {"id": assignment.id, "accepted": None, "changes": changes}
+
+
+def expand_assignments(db: Session, assignments, expand):
+    """Dokłada do przydziałów (słowników z `changes`) developerów i taski z ich
+    zmian - jedno zapytanie na rodzaj dla całej listy, a nie na przydział.
+    Usunięte w międzyczasie taski i developerzy są pomijani."""
+    if schemas.AssignmentExpand.DEVELOPERS in expand:
+        developers = get_developers(
+            db,
+            list(dict.fromkeys(d for a in assignments for d in a["changes"])),
+        )
+        for assignment in assignments:
+            assignment["developers"] = [
+                developers[developer_id]
+                for developer_id in assignment["changes"]
+                if developer_id in developers
+            ]
+    if schemas.AssignmentExpand.TASKS in expand:
+        tasks = get_tasks(
+            db,
+            dict.fromkeys(
+                task_id
+                for a in assignments
+                for task_ids in a["changes"].values()
+                for task_id in task_ids
+            ),
+        )
+        for assignment in assignments:
+            assignment["tasks"] = [
+                tasks[task_id]
+                for task_ids in assignment["changes"].values()
+                for task_id in task_ids
+                if task_id in tasks
+            ]
+    return assignments
+
+
+def read_assignment(
+    db: Session, project_id: int, assignment_id: int, expand=frozenset()
+):
     response = {"changes": {}}
     assignment = (
         db.query(models.Assignment)
@@ -350,27 +1234,105 @@ def read_assignment(db: Session, project_id: int, assignment_id: int):
             response["changes"][change.developer_id].append(change.task_id)
     response["accepted"] = assignment.accepted
     response["id"] = assignment_id
+    if expand:
+        expand_assignments(db, [response], expand)
     return response
 
 
-def read_project_assignments(db: Session, project_id: int):
-    response = []
-    assignments = (
-        db.query(models.Assignment)
-        .filter(models.Assignment.project_id == project_id)
-        .all()
+def read_project_assignments(
+    db: Session,
+    project_id: int,
+    skip: int = 0,
+    limit: int = None,
+    cursor: str = None,
+    expand=frozenset(),
+):
+    assignments, next_cursor = paginate(
+        db.query(models.Assignment).filter(models.Assignment.project_id == project_id),
+        models.Assignment.id,
+        skip,
+        limit,
+        cursor,
     )
-    if assignments is None or len(assignments) == 0:
+    if len(assignments) == 0:
         raise HTTPException(
             status_code=404, detail="There are no assignments in this project."
         )
-    for a in assignments:
-        response.append(read_assignment(db, project_id, a.id))
-    return response
+    response = {
+        a.id: {"id": a.id, "accepted": a.accepted, "changes": {}} for a in assignments
+    }
+    # zmiany całej strony jednym zapytaniem
+    changes = (
+        db.query(
+            models.ProposedChange.assignment_id,
+            models.ProposedChange.developer_id,
+            models.ProposedChange.task_id,
+        )
+        .filter(models.ProposedChange.assignment_id.in_(response.keys()))
+        .order_by(models.ProposedChange.id)
+        .all()
+    )
+    for assignment_id, developer_id, task_id in changes:
+        response[assignment_id]["changes"].setdefault(developer_id, []).append(task_id)
+    if expand:
+        expand_assignments(db, list(response.values()), expand)
+    return list(response.values()), next_cursor
+
+
+def project_has_assignments(db: Session, project_id: int):
+    return (
+        db.query(models.Assignment.id)
+        .filter(models.Assignment.project_id == project_id)
+        .first()
+        is not None
+    )
+
+
+def stream_project_assignments(project_id: int):
+    """Przydziały projektu jako kawałki NDJSON. Zmiany są czytane jednym zapytaniem
+    posortowanym po przydziale, więc w pamięci jest tylko bieżący przydział."""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(
+                models.Assignment.id,
+                models.Assignment.accepted,
+                models.ProposedChange.developer_id,
+                models.ProposedChange.task_id,
+            )
+            .outerjoin(
+                models.ProposedChange,
+                models.ProposedChange.assignment_id == models.Assignment.id,
+            )
+            .filter(models.Assignment.project_id == project_id)
+            .order_by(models.Assignment.id, models.ProposedChange.id)
+            .yield_per(STREAM_CHUNK_SIZE)
+        )
+        lines = []
+        current = None
+        for assignment_id, accepted, developer_id, task_id in rows:
+            if current is None or current["id"] != assignment_id:
+                if current is not None:
+                    lines.append(responses.dumps(current))
+                    if len(lines) == STREAM_CHUNK_SIZE:
+                        yield b"\n".join(lines) + b"\n"
+                        lines = []
+                current = {"id": assignment_id, "accepted": accepted, "changes": {}}
+            if developer_id is not None:
+                current["changes"].setdefault(developer_id, []).append(task_id)
+        if current is not None:
+            lines.append(responses.dumps(current))
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+    finally:
+        db.close()
 
 
 def update_assignment(
-    db: Session, project_id: int, assignment_id: int, assignment: schemas.TaskUpdate
+    db: Session,
+    project_id: int,
+    assignment_id: int,
+    assignment: schemas.AssignmentUpdate,
 ):
     existing_assignment = (
         db.query(models.Assignment)
@@ -385,27 +1347,81 @@ def update_assignment(
         setattr(existing_assignment, field, value)
 
     if assignment.accepted:
-        changes = (
-            db.query(models.ProposedChange)
-            .filter(models.ProposedChange.assignment_id == assignment_id)
-            .all()
+        now = datetime.utcnow()
+        # taski przed zmianą (z nowym developerem) - do różnicy w agregatach
+        changed = db.execute(
+            select(
+                *analytics.TASK_COLUMNS,
+                models.Task.id,
+                models.Task.name,
+                models.ProposedChange.developer_id,
+            )
+            .join(
+                models.ProposedChange, models.ProposedChange.task_id == models.Task.id
+            )
+            .where(models.ProposedChange.assignment_id == assignment_id)
+            .where(models.Task.project_id == project_id)
+        ).all()
+        removed = [analytics.snapshot(task) for task in changed]
+        added = [
+            task._replace(
+                developer_id=row[-1], state="IN_PROGRESS", datetime_assigned=now
+            )
+            for task, row in zip(removed, changed)
+        ]
+        analytics.apply(db, removed=removed, added=added)
+        events.record(
+            db,
+            [
+                events.new_event(
+                    schemas.TaskEventType.TASK_UPDATED,
+                    project_id,
+                    row.id,
+                    task=events.task_data({**task._asdict(), "name": row.name}),
+                    changed=["datetime_assigned", "developer_id", "state"],
+                    assignment_id=assignment_id,
+                )
+                for task, row in zip(added, changed)
+            ]
+            + [
+                events.new_event(
+                    schemas.TaskEventType.ASSIGNMENT_ACCEPTED,
+                    project_id,
+                    assignment_id=assignment_id,
+                    task_ids=[row.id for row in changed],
+                )
+            ],
         )
-        for change in changes:
-            update_task(
-                db,
-                project_id,
-                change.task_id,
-                schemas.TaskUpdate(
-                    developer_id=change.developer_id,
-                    datetime_assigned=datetime.utcnow(),
-                    state="IN_PROGRESS",
-                ),
+        # jedno UPDATE ... FROM proposed_change dla wszystkich zmian i jeden commit,
+        # więc przydział wchodzi w życie w całości albo wcale
+        db.execute(
+            update(models.Task)
+            .where(models.Task.id == models.ProposedChange.task_id)
+            .where(models.ProposedChange.assignment_id == assignment_id)
+            .where(models.Task.project_id == project_id)
+            .values(
+                developer_id=models.ProposedChange.developer_id,
+                datetime_assigned=now,
+                state="IN_PROGRESS",
             )
+            .execution_options(synchronize_session=False)
+        )
     else:
         db.query(models.ProposedChange).filter(
             models.ProposedChange.assignment_id == assignment_id
         ).delete()
-        db.commit()
+        events.record(
+            db,
+            [
+                events.new_event(
+                    schemas.TaskEventType.ASSIGNMENT_REJECTED,
+                    project_id,
+                    assignment_id=assignment_id,
+                )
+            ],
+        )
+    bump_project_version(db, project_id)
+    db.commit()
 
 
 def delete_assignment(db: Session, project_id: int, assignment_id: int):
@@ -415,4 +1431,5 @@ def delete_assignment(db: Session, project_id: int, assignment_id: int):
     db.query(models.ProposedChange).filter(
         models.ProposedChange.assignment_id == assignment_id
     ).delete()
+    bump_project_version(db, project_id)
     db.commit()
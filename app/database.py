@@ -1,14 +1,70 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from dotenv import load_dotenv
 
 load_dotenv()
-SQLALCHEMY_DATABASE_URL = "sqlite:///./database/app.db"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./database/app.db")
+# "production" - WAL i pragmy poniżej, "default" - SQLite z ustawieniami domyślnymi
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "production")
+# pula na proces - każdy worker uvicorna ma własną, więc liczy się wątki jednego
+# procesu (requesty, zadania przydziału, streaming), a nie liczbę workerów
+POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", 10))
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    # ujemna wartość to rozmiar w KiB
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024)),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def is_memory_database(url):
+    # sqlite://, sqlite:///:memory: i URI z mode=memory
+    url = make_url(url)
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def create_db_engine(url=SQLALCHEMY_DATABASE_URL, profile=DATABASE_PROFILE):
+    if not url.startswith("sqlite"):
+        # np. postgresql+psycopg://... - pragmy SQLite nie mają tu sensu
+        return create_engine(
+            url, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_pre_ping=True
+        )
+    if is_memory_database(url):
+        # baza w pamięci istnieje tylko w swoim połączeniu - wszystkie wątki
+        # dzielą jedno (StaticPool), więc rozmiar puli nie ma tu znaczenia
+        pool_options = {"poolclass": StaticPool}
+    else:
+        pool_options = {"pool_size": POOL_SIZE, "max_overflow": MAX_OVERFLOW}
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, **pool_options
+    )
+    if profile == "production":
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
+engine = create_db_engine()
+
+# expire_on_commit=False - obiekty zwrócone z crud są serializowane już po
+# commicie, bez ponownego odczytu każdego z nich z bazy
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 Base = declarative_base()
@@ -1,4 +1,10 @@
+from typing import Optional
+from fastapi import HTTPException, Query
 from .database import SessionLocal
+from . import schemas
+
+# więcej id trzeba wysłać w body (POST ...:lookup) - URL ma ograniczoną długość
+MAX_QUERY_IDS = 1000
 
 
 def get_db():
@@ -7,3 +13,49 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def split_values(values):
+    # ?ids=1,2,3 i ?ids=1&ids=2&ids=3 znaczą to samo
+    return [part for value in values for part in value.split(",") if part]
+
+
+def query_ids(
+    ids: Optional[list[str]] = Query(
+        default=None,
+        description=f"Comma-separated ids (at most {MAX_QUERY_IDS}).",
+    )
+):
+    """Lista id z query bez powtórzeń, w kolejności podania, albo None, jeśli
+    parametru nie ma."""
+    if ids is None:
+        return None
+    try:
+        parsed = [int(part) for part in split_values(ids)]
+    except ValueError:
+        raise HTTPException(
+            status_code=422, detail="ids must be comma-separated integers"
+        )
+    if len(parsed) > MAX_QUERY_IDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_QUERY_IDS} ids in the query, "
+            "send longer lists in the body of the :lookup endpoint",
+        )
+    return list(dict.fromkeys(parsed))
+
+
+def query_expand(
+    expand: Optional[list[str]] = Query(
+        default=None,
+        description="Comma-separated objects to include: developers, tasks.",
+    )
+):
+    try:
+        return {schemas.AssignmentExpand(part) for part in split_values(expand or [])}
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail="expand accepts: "
+            + ", ".join(item.value for item in schemas.AssignmentExpand),
+        )
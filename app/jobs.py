@@ -0,0 +1,78 @@
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from dotenv import load_dotenv
+from .database import SessionLocal
+from . import crud
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+# ile przydziałów liczy się naraz i ile może czekać w kolejce
+MAX_CONCURRENT_JOBS = int(os.getenv("ASSIGNMENT_JOB_WORKERS", 2))
+MAX_QUEUED_JOBS = int(os.getenv("ASSIGNMENT_JOB_QUEUE_LIMIT", 10))
+# ile zakończonych zadań trzymamy w pamięci do odpytania
+FINISHED_JOBS_KEPT = 1000
+
+executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="assignment-job"
+)
+jobs = {}
+finished_jobs = deque()
+lock = threading.Lock()
+
+
+def run_job(job_id, strategy, capacity, incremental=False):
+    job = jobs[job_id]
+    job["state"] = "RUNNING"
+    db = SessionLocal()
+    try:
+        job["assignment"] = crud.create_assignment(
+            db, job["project_id"], strategy, capacity, incremental
+        )
+        job["state"] = "DONE"
+    except HTTPException as e:
+        job["error"] = e.detail
+        job["state"] = "FAILED"
+    except Exception:
+        logger.exception("assignment job failed job_id=%s", job_id)
+        job["error"] = "Assignment failed"
+        job["state"] = "FAILED"
+    finally:
+        db.close()
+        with lock:
+            finished_jobs.append(job_id)
+            while len(finished_jobs) > FINISHED_JOBS_KEPT:
+                jobs.pop(finished_jobs.popleft(), None)
+
+
+def submit_assignment_job(
+    project_id: int, strategy: str, capacity: int = None, incremental: bool = False
+):
+    with lock:
+        pending = sum(1 for j in jobs.values() if j["state"] in ("QUEUED", "RUNNING"))
+        if pending >= MAX_CONCURRENT_JOBS + MAX_QUEUED_JOBS:
+            raise HTTPException(
+                status_code=429, detail="Too many assignment jobs, try again later"
+            )
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "project_id": project_id,
+            "state": "QUEUED",
+            "assignment": None,
+            "error": None,
+        }
+        jobs[job_id] = job
+    executor.submit(run_job, job_id, strategy, capacity, incremental)
+    return job
+
+
+def read_assignment_job(project_id: int, job_id: str):
+    job = jobs.get(job_id)
+    if job is None or job["project_id"] != project_id:
+        raise HTTPException(status_code=404, detail="Assignment job not found")
+    return job
@@ -1,22 +1,55 @@
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from . import models
+from .migrations import check_schema, migrate
 from .database import SessionLocal, engine
-from .routers import developer, project
+from .metrics import InstrumentationMiddleware, instrument_engine
+from .routers import cache, developer, events, health, metrics, project
 from dotenv import load_dotenv
 
 load_dotenv()
-models.Base.metadata.create_all(bind=engine)
+# logi aplikacji (logger "app" i jego dzieci); DEBUG włącza m.in. szczegóły
+# przydziału, na niższych poziomach te komunikaty nie są nawet formatowane
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s %(message)s")
+logging.getLogger("app").setLevel(LOG_LEVEL)
+# `python -m app.serve` migruje bazę raz, przed startem workerów, i wyłącza to
+# tutaj - workery tylko sprawdzają schemat. Przy `uvicorn app.main:app` (jeden
+# proces) brakujący schemat jest tworzony przy starcie.
+AUTO_MIGRATE = os.getenv("DATABASE_AUTO_MIGRATE", "true").lower() == "true"
 
+instrument_engine(engine)
 
-app = FastAPI()
 
-app.include_router(developer.router)
-app.include_router(project.router)
+def prepare_schema():
+    missing = check_schema(engine)
+    if missing and AUTO_MIGRATE:
+        migrate(engine)
+        missing = check_schema(engine)
+    if missing:
+        raise RuntimeError(
+            f"Database schema is out of date, missing: {', '.join(missing)}. "
+            "Run `python -m app.migrations` first."
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prepare_schema()
+    # od teraz GET /health/ready odpowiada 200
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    engine.dispose()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(InstrumentationMiddleware)
+
+app.include_router(developer.router)
+app.include_router(project.router)
+app.include_router(cache.router)
+app.include_router(events.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
@@ -0,0 +1,223 @@
+import asyncio
+import cProfile
+import contextvars
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+from urllib.parse import parse_qs
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from dotenv import load_dotenv
+
+load_dotenv()
+# ?profile=1 zwraca zamiast odpowiedzi podsumowanie cProfile - tylko gdy włączone
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true")
+PROFILE_ROWS = 40
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Histogram:
+    """Histogram w stylu Prometheusa: liczniki kubełków, suma i liczba obserwacji
+    osobno dla każdego zestawu etykiet."""
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * len(self.buckets), 0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted(self.series.items())
+            for label_values, (counts, total, count) in items:
+                labels = format_labels(zip(self.labels, label_values))
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(
+                        f'{self.name}_bucket{{{labels},le="{bound}"}} {bucket_count}'
+                    )
+                lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{labels}}} {total}")
+                lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return "\n".join(lines)
+
+
+def format_labels(pairs):
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return ",".join(f'{name}="{value}"' for name, value in escaped)
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+request_statements = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    STATEMENT_BUCKETS,
+)
+request_db_time = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per request.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+
+# liczniki bieżącego requestu; poza requestem (np. zadania przydziału) None
+current_request = contextvars.ContextVar("current_request", default=None)
+# profile z wątków puli requestu z ?profile=1 (lista cProfile.Profile), poza nim None
+current_profiles = contextvars.ContextVar("current_profiles", default=None)
+
+
+def instrument_engine(engine):
+    """Liczy zapytania i czas w bazie dla bieżącego requestu."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def finish_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["statement_start"].pop()
+        stats = current_request.get()
+        if stats is not None:
+            stats["statements"] += 1
+            stats["db_time"] += elapsed
+
+
+def profiled(function):
+    """Funkcja, która w requeście z ?profile=1 profiluje się w wątku, w którym
+    działa. cProfile widzi tylko wątek, w którym go włączono, a endpointy `def`
+    (i `run_in_threadpool`) działają na puli wątków, a nie w wątku pętli."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profiles = current_profiles.get()
+        if profiles is None:
+            return function(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiles.append(profiler)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Trasa, której endpoint `def` jest profilowany przez `profiled`."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint):
+            endpoint = profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class InstrumentationMiddleware:
+    """Mierzy każdy request HTTP: czas, liczbę zapytań SQL i czas w bazie,
+    z etykietą szablonu trasy (np. `/project/{id}`), a nie konkretnej ścieżki."""
+
+    def __init__(self, app):
+        self.app = app
+        # cProfile w wątku pętli zdarzeń widzi wszystkie jej requesty - profilujemy
+        # po jednym; endpointy z puli wątków profiluje `profiled`
+        self.profile_lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if PROFILING_ENABLED and parse_qs(scope["query_string"].decode()).get(
+            "profile"
+        ) == ["1"]:
+            await self.profile(scope, receive, send)
+            return
+        stats = {"statements": 0, "db_time": 0.0, "status": 500}
+        token = current_request.set(stats)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                stats["status"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = scope.get("route")
+            # nieznane ścieżki pod jedną etykietą, żeby nie mnożyć serii
+            template = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            request_duration.observe((method, template, str(stats["status"])), elapsed)
+            request_statements.observe((method, template), stats["statements"])
+            request_db_time.observe((method, template), stats["db_time"])
+
+    async def profile(self, scope, receive, send):
+        async def discard(message):
+            pass
+
+        async with self.profile_lock:
+            profiles = []
+            token = current_profiles.set(profiles)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.disable()
+                current_profiles.reset(token)
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        if profiles:
+            stats.add(*profiles)
+        stats.sort_stats("cumulative").print_stats(PROFILE_ROWS)
+        body = output.getvalue().encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def render():
+    return "\n".join(
+        histogram.render()
+        for histogram in (request_duration, request_statements, request_db_time)
+    )
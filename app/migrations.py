@@ -0,0 +1,78 @@
+from sqlalchemy import inspect, text
+from .database import engine
+from . import analytics, models
+
+
+def migrate(bind=engine):
+    """Doprowadza istniejącą bazę do schematu z `models`.
+
+    `create_all` tworzy tylko brakujące tabele, a kolumn i indeksów na tabelach,
+    które już istnieją, nie dodaje - te tworzymy osobno. Nowe kolumny muszą mieć
+    `server_default` albo dopuszczać NULL, żeby dało się je dodać do tabeli
+    z wierszami. Przed unikalnym indeksem na project_developer usuwamy
+    zdublowane przypisania developera do projektu. Nowo utworzone tabele
+    agregatów są od razu wypełniane z istniejących tasków.
+    """
+    inspector = inspect(bind)
+    new_aggregates = [
+        table
+        for table in analytics.AGGREGATES
+        if not inspector.has_table(table.__tablename__)
+    ]
+    models.Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        for table in models.Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                ddl += column.type.compile(dialect=connection.dialect)
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                connection.execute(text(ddl))
+        connection.execute(
+            text(
+                "DELETE FROM project_developer WHERE id NOT IN ("
+                "SELECT MIN(id) FROM project_developer "
+                "GROUP BY project_id, developer_id)"
+            )
+        )
+        for table in models.Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+        if new_aggregates:
+            analytics.rebuild(connection)
+
+
+def check_schema(bind=engine):
+    """Czego brakuje w bazie względem `models` (tabele, kolumny, indeksy) -
+    pusta lista, gdy schemat jest aktualny. Tylko czyta, więc może to robić
+    naraz każdy worker, w przeciwieństwie do `migrate`."""
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table in models.Base.metadata.sorted_tables:
+        if table.name not in tables:
+            missing.append(f"table {table.name}")
+            continue
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        missing += [
+            f"column {table.name}.{column.name}"
+            for column in table.columns
+            if column.name not in columns
+        ]
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing += [
+            f"index {index.name}"
+            for index in table.indexes
+            if index.name not in indexes
+        ]
+    return missing
+
+
+if __name__ == "__main__":
+    migrate()
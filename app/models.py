@@ -1,4 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Date,
+    DateTime,
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    JSON,
+    func,
+)
 from datetime import datetime
 from .database import Base
 
@@ -21,7 +33,8 @@ class Task(Base):
     __tablename__ = "task"
     id = Column(Integer, primary_key=True, nullable=False, index=True)
     name = Column(String, nullable=False)
-    project_id = Column(Integer, ForeignKey("project.id"), nullable=False)
+    # sam project_id: listowanie i kursor po id (indeks zawiera rowid)
+    project_id = Column(Integer, ForeignKey("project.id"), nullable=False, index=True)
     state = Column(String, nullable=False, default="NOT_ASSIGNED")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow())
     estimation = Column(Integer, nullable=False)
@@ -31,13 +44,37 @@ class Task(Base):
     )
     datetime_assigned = Column(DateTime, nullable=True, default=None)
     datetime_completed = Column(DateTime, nullable=True, default=None)
+    # ostatnia zmiana taska (także przez UPDATE z Core) - przydział przyrostowy
+    # przeplanowuje taski zmienione po poprzednim planie
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
+
+    # taski projektu, także po stanie (przydział czyta CLOSED i NOT_ASSIGNED)
+    __table_args__ = (
+        Index("ix_task_project_id_state", "project_id", "state"),
+        # wszystkie kolumny statystyk ukończeń - historia jest czytana z samego
+        # indeksu, w kolejności grupowania, bez sięgania do wierszy tabeli
+        Index(
+            "ix_task_completion_history",
+            "project_id",
+            "state",
+            "developer_id",
+            "estimation",
+            "datetime_assigned",
+            "datetime_completed",
+        ),
+    )
 
 
 class Project(Base):
     __tablename__ = "project"
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    developer_owner_id = Column(Integer, ForeignKey("developer.id"), nullable=False)
+    developer_owner_id = Column(
+        Integer, ForeignKey("developer.id"), nullable=False, index=True
+    )
     name = Column(String, nullable=False)
+    # podbijana przy każdej zmianie tasków, składu i przydziałów projektu - z niej
+    # jest ETag odczytów projektu
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
 
 class ProjectDeveloper(Base):  # przypisanie developera do projektu
@@ -49,6 +86,18 @@ class ProjectDeveloper(Base):  # przypisanie developera do projektu
         Integer, ForeignKey("developer.id"), nullable=False, index=True
     )
     project_id = Column(Integer, ForeignKey("project.id"), nullable=False)
+    # kiedy developer dołączył do projektu (istniejące wiersze po migracji: NULL)
+    created_at = Column(DateTime, nullable=True, default=datetime.utcnow)
+
+    # developerzy projektu; developer może być w projekcie tylko raz
+    __table_args__ = (
+        Index(
+            "ix_project_developer_project_id_developer_id",
+            "project_id",
+            "developer_id",
+            unique=True,
+        ),
+    )
 
 
 class Assignment(Base):
@@ -57,9 +106,11 @@ class Assignment(Base):
         Integer, primary_key=True, nullable=False, index=True, autoincrement=True
     )
     project_id = Column(
-        Integer, ForeignKey("project.id"), nullable=False
+        Integer, ForeignKey("project.id"), nullable=False, index=True
     )
     accepted = Column(Boolean, default=None, nullable=True) #jak true to wdraża w życie proposed change jak false to usuwa je
+    # chwila, z której stanu pochodzą propozycje (ustawiana też przy przeplanowaniu)
+    planned_at = Column(DateTime, nullable=True, default=None)
 
 class ProposedChange(
     Base
@@ -68,8 +119,71 @@ class ProposedChange(
     id = Column(
         Integer, primary_key=True, nullable=False, index=True, autoincrement=True
     )
-    assignment_id = Column(Integer, ForeignKey("assignment.id"), nullable=False)
+    assignment_id = Column(
+        Integer, ForeignKey("assignment.id"), nullable=False, index=True
+    )
     developer_id = Column(
         Integer, ForeignKey("developer.id"), nullable=False, index=True
     )
     task_id = Column(Integer, nullable=False)
+
+    # propozycja dla taska w przydziale (przeplanowanie łączy taski z propozycjami)
+    __table_args__ = (
+        Index("ix_proposed_change_assignment_id_task_id", "assignment_id", "task_id"),
+    )
+
+
+# Zagregowane statystyki tasków (app.analytics) - aktualizowane przy każdej zmianie
+# taska w tej samej transakcji, więc odczyt nie zależy od długości historii.
+# developer_id 0 to taski bez developera.
+class OpenTaskStats(Base):  # otwarte taski i ich estymacja
+    __tablename__ = "open_task_stats"
+    project_id = Column(Integer, primary_key=True)
+    developer_id = Column(Integer, primary_key=True)
+    state = Column(String, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    estimation_sum = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_open_task_stats_developer_id", "developer_id"),)
+
+
+class ClosedTaskWeeklyStats(Base):  # zamknięte taski w tygodniu (od poniedziałku)
+    __tablename__ = "closed_task_weekly_stats"
+    project_id = Column(Integer, primary_key=True)
+    developer_id = Column(Integer, primary_key=True)
+    week = Column(Date, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_closed_task_weekly_stats_developer_id", "developer_id"),
+    )
+
+
+class CycleTimeStats(Base):  # czas od przypisania do zamknięcia
+    __tablename__ = "cycle_time_stats"
+    project_id = Column(Integer, primary_key=True)
+    developer_id = Column(Integer, primary_key=True)
+    specialization = Column(String, primary_key=True)
+    estimation = Column(Integer, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    seconds_sum = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (Index("ix_cycle_time_stats_developer_id", "developer_id"),)
+
+
+class TaskEvent(Base):  # dziennik zmian (app.events) - tylko dopisywany
+    __tablename__ = "task_event"
+    # numer kolejny zdarzenia; AUTOINCREMENT w SQLite nie używa ponownie numerów
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    type = Column(String, nullable=False)
+    project_id = Column(Integer, nullable=False)
+    task_id = Column(Integer, nullable=True)
+    # czas z bazy - przy executemany tysięcy zdarzeń bez konwersji w Pythonie
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    data = Column(JSON, nullable=False)
+
+    # zdarzenia jednego projektu od danego numeru
+    __table_args__ = (
+        Index("ix_task_event_project_id_id", "project_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
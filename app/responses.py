@@ -0,0 +1,44 @@
+"""Szybka ścieżka JSON dla dużych list (taski, projekty, przydziały).
+
+Zwykła trasa z `response_model` ładuje obiekty modelu, a FastAPI waliduje każdy
+z nich ponownie schematem Pydantic przed zapisaniem JSON. Trasy, które same się
+na to zdecydują, czytają z bazy tylko kolumny ze schematu i oddają gotowe
+słowniki do orjson - bez obiektów modelu i bez walidacji. Wiersze z bazy są
+zaufane: trafiły tam przez walidację przy zapisie. Wynik jest bajt w bajt taki
+sam jak z `response_model` (kolejność pól ze schematu, daty w ISO 8601, klucze
+int jako napisy).
+"""
+import orjson
+from fastapi import Response
+
+
+def dumps(content):
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
+
+
+def fast_json(content, response: Response = None):
+    """Odpowiedź z `content` przez orjson. Zwrócona wprost odpowiedź pomija
+    nagłówki ustawione na `response` z zależności trasy (np. ETag), więc są
+    tu przepisywane."""
+    fast = ORJSONResponse(content)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
+
+
+def schema_columns(schema, model):
+    """Kolumny modelu w kolejności pól schematu - słownik z wiersza ma wtedy
+    te same klucze i kolejność co odpowiedź z `response_model`."""
+    return [getattr(model, field) for field in schema.model_fields]
+
+
+def rows_to_dicts(rows, columns):
+    fields = [column.key for column in columns]
+    return [dict(zip(fields, row)) for row in rows]
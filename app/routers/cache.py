@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from .. import cache
+from ..metrics import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get(
+    "/cache/stats",
+    tags=["Cache"],
+    description="Returns hit, miss and eviction counters of the in-process caches.",
+)
+async def read_cache_stats_route():
+    return [cache.developers.stats(), cache.project_developers.stats()]
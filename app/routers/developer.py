@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, Response, HTTPException
-from ..dependencies import get_db
+from fastapi import APIRouter, Depends, Response, HTTPException, Query
+from ..dependencies import get_db, query_ids
 from .. import schemas, crud
+from ..metrics import ProfiledRoute
 from sqlalchemy.orm import Session
+from typing import Optional
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/developer", response_model=schemas.Developer, tags=["Developer"])
-async def create_developer_route(
+def create_developer_route(
     developer: schemas.DeveloperCreate, db: Session = Depends(get_db)
 ):
     new_developer = crud.create_developer(db, developer)
@@ -15,32 +17,77 @@ async def create_developer_route(
 
 
 @router.get("/developer/{id}", response_model=schemas.Developer, tags=["Developer"])
-async def read_developer_route(id: int, db: Session = Depends(get_db)):
+def read_developer_route(id: int, db: Session = Depends(get_db)):
     developer = crud.read_developer(db, id)
     if developer is None:
         raise HTTPException(status_code=404, detail="Developer not found")
     return developer
 
 
-@router.get("/developers", response_model=list[schemas.Developer], tags=["Developer"])
-async def read_developers_route(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+@router.get(
+    "/developer/{id}/stats",
+    response_model=schemas.DeveloperStats,
+    tags=["Developer"],
+    description="Workload and throughput of a developer across projects: "
+    "estimation of tasks in progress, tasks closed per week for the last `weeks` "
+    "weeks and average cycle time (assigned to closed) by specialization and "
+    "estimation.",
+)
+def read_developer_stats_route(
+    id: int,
+    weeks: int = Query(default=12, gt=0, le=520),
+    db: Session = Depends(get_db),
 ):
-    developers = crud.read_developers(db, skip, limit)
+    return crud.read_developer_stats(db, id, weeks)
+
+
+@router.get(
+    "/developers",
+    response_model=list[schemas.Developer],
+    tags=["Developer"],
+    description="Returns a page of developers. With `ids` returns exactly those "
+    "developers in the given order (404 lists the missing ones).",
+)
+def read_developers_route(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(default=100, gt=0),
+    cursor: Optional[str] = None,
+    ids: Optional[list[int]] = Depends(query_ids),
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        return crud.read_developers_by_ids(db, ids)
+    developers, next_cursor = crud.read_developers(db, skip, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     if developers is None:
         raise HTTPException(status_code=404, detail="No developers found")
     return developers
 
 
+@router.post(
+    "/developers:lookup",
+    response_model=list[schemas.Developer],
+    tags=["Developer"],
+    description="Same as `GET /developers?ids=...` for lists too long for a URL.",
+)
+def lookup_developers_route(lookup: schemas.IdsLookup, db: Session = Depends(get_db)):
+    ids = list(dict.fromkeys(lookup.ids))
+    return crud.read_developers_by_ids(db, ids)
+
+
 @router.put("/developer/{id}", tags=["Developer"])
-async def update_developer_route(
-    id: int, developer: schemas.DeveloperUpdate, db: Session = Depends(get_db)
+def update_developer_route(
+    id: int,
+    developer: schemas.DeveloperUpdate,
+    db: Session = Depends(get_db),
 ):
     crud.update_developer(db, id, developer)
     return Response(status_code=204)
 
 
 @router.delete("/developer/{id}", tags=["Developer"])
-async def delete_developer_route(id: int, db: Session = Depends(get_db)):
+def delete_developer_route(id: int, db: Session = Depends(get_db)):
     crud.delete_developer(db, id)
     return Response(status_code=204)
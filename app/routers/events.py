@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from .. import schemas, events
+from ..metrics import ProfiledRoute
+from typing import Optional
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get(
+    "/events",
+    response_model=list[schemas.TaskEvent],
+    tags=["Events"],
+    description="Returns task events with sequence numbers greater than `after`, "
+    "in order. With `wait` the request blocks until an event arrives or the time "
+    "runs out (long polling). With `Accept: text/event-stream` or `stream=true` "
+    "the events are sent as Server-Sent Events; `Last-Event-ID` resumes the stream.",
+)
+async def read_events_route(
+    request: Request,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, gt=0, le=1000),
+    project_id: Optional[int] = None,
+    wait: float = Query(0, ge=0, le=events.MAX_WAIT_SECONDS),
+    stream: bool = False,
+    last_event_id: Optional[int] = Header(None),
+):
+    if stream or "text/event-stream" in request.headers.get("accept", ""):
+        # przy wznowieniu przeglądarka odsyła numer ostatniego odebranego zdarzenia
+        if last_event_id is not None:
+            after = max(after, last_event_id)
+        return StreamingResponse(
+            events.stream(after, project_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+    return await events.long_poll(after, limit, project_id, wait)
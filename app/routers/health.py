@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..dependencies import get_db
+from .. import crud
+from ..metrics import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get(
+    "/health/ready",
+    tags=["Health"],
+    description="Responds with 200 once the worker has checked the database schema "
+    "at startup and the database answers, 503 otherwise. Meant for load balancers "
+    "and container health checks.",
+)
+def read_readiness_route(request: Request, db: Session = Depends(get_db)):
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Starting")
+    try:
+        crud.check_database(db)
+    except SQLAlchemyError:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "ready"}
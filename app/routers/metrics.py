@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from .. import cache, metrics
+
+router = APIRouter(route_class=metrics.ProfiledRoute)
+
+CACHE_COUNTERS = ("hits", "misses", "evictions")
+
+
+@router.get(
+    "/metrics",
+    tags=["Metrics"],
+    description="Request latency, SQL statements per request and cache counters in "
+    "the Prometheus text format.",
+    response_class=PlainTextResponse,
+)
+async def read_metrics_route():
+    lines = [metrics.render()]
+    caches = [cache.developers.stats(), cache.project_developers.stats()]
+    for counter in CACHE_COUNTERS:
+        lines.append(f"# TYPE app_cache_{counter}_total counter")
+        for stats in caches:
+            lines.append(
+                f'app_cache_{counter}_total{{cache="{stats["name"]}"}} {stats[counter]}'
+            )
+    lines.append("# TYPE app_cache_entries gauge")
+    for stats in caches:
+        lines.append(f'app_cache_entries{{cache="{stats["name"]}"}} {stats["size"]}')
+    return PlainTextResponse(
+        "\n".join(lines) + "\n", media_type="text/plain; version=0.0.4"
+    )
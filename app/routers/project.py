@@ -1,9 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from ..dependencies import get_db
-from .. import schemas, crud
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..dependencies import get_db, query_expand, query_ids
+from .. import schemas, crud, jobs
+from ..responses import fast_json
+from ..metrics import ProfiledRoute, profiled
 from sqlalchemy.orm import Session
+from typing import Optional
+import json
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+
+def wants_ndjson(request: Request, stream: bool):
+    return stream or "application/x-ndjson" in request.headers.get("accept", "")
+
+
+def check_etag(request: Request, response: Response, db: Session, project_id: int):
+    """Słaby ETag z wersji projektu. Zwraca odpowiedź 304, jeśli klient ma aktualną
+    wersję; wtedy trasa nie ładuje już żadnych wierszy.
+
+    Wersja jest czytana przed danymi, więc równoległa zmiana może najwyżej dać
+    starszy ETag do nowszych danych (następny odczyt zwróci 200), a nigdy 304
+    dla nieaktualnej kopii."""
+    version = crud.read_project_version(db, project_id)
+    if version is None:
+        return None
+    etag = f'W/"{project_id}-{version}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # porównanie słabe - bez przedrostka W/
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
 
 
 @router.post(
@@ -12,9 +43,7 @@ router = APIRouter()
     description="Creates a project.",
     response_model=schemas.Project,
 )
-async def create_project_route(
-    project: schemas.ProjectCreate, db: Session = Depends(get_db)
-):
+def create_project_route(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
     new_project = crud.create_project(db, project)
     return new_project
 
@@ -23,46 +52,79 @@ async def create_project_route(
     "/projects",
     response_model=list[schemas.Project],
     tags=["Project"],
-    description="Returns all projects.",
+    description="Returns all projects. If there are more, the `X-Next-Cursor` "
+    "header holds the `cursor` for the next page.",
 )
-async def read_projects_route(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+def read_projects_route(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(default=100, gt=0),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
 ):
-    projects = crud.read_projects(db, skip, limit)
+    projects, next_cursor = crud.read_projects(db, skip, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     if projects is None:
         raise HTTPException(status_code=404, detail="No projects found")
-    return projects
+    return fast_json(projects, response)
 
 
 @router.get(
     "/project/{id}",
     response_model=schemas.Project,
     tags=["Project"],
-    description="Returns a project by it's id.",
+    description="Returns a project by it's id. Responds with 304 when `If-None-Match` "
+    "matches the current `ETag`.",
 )
-async def read_project_route(id: int, db: Session = Depends(get_db)):
+def read_project_route(
+    id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    not_modified = check_etag(request, response, db, id)
+    if not_modified is not None:
+        return not_modified
     project = crud.read_project(db, id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
+@router.get(
+    "/project/{id}/stats",
+    response_model=schemas.ProjectStats,
+    tags=["Project"],
+    description="Workload and throughput of a project: count and estimation of "
+    "unassigned and in-progress tasks, tasks closed per week for the last `weeks` "
+    "weeks and average cycle time (assigned to closed) by specialization and "
+    "estimation.",
+)
+def read_project_stats_route(
+    id: int,
+    weeks: int = Query(default=12, gt=0, le=520),
+    db: Session = Depends(get_db),
+):
+    return crud.read_project_stats(db, id, weeks)
+
+
 @router.get(
     "/project/developer/{developer_id}",
     response_model=list[schemas.Project],
     tags=["Project"],
     description="Returns all project belonging to the specified developer.",
 )
-async def read_project_developer_route(
-    developer_id: int, db: Session = Depends(get_db)
-):
+def read_project_developer_route(developer_id: int, db: Session = Depends(get_db)):
     projects = crud.read_project_developer(db, developer_id)
     return projects
 
 
 @router.put("/project/{project_id}", tags=["Project"], description="Edits a project.")
-async def update_project_route(
-    project_id: int, project: schemas.ProjectUpdate, db: Session = Depends(get_db)
+def update_project_route(
+    project_id: int,
+    project: schemas.ProjectUpdate,
+    db: Session = Depends(get_db),
 ):
     crud.update_project(db, project_id, project)
     return Response(status_code=204)
@@ -74,20 +136,55 @@ async def update_project_route(
     tags=["Task"],
     description="Creates a task in a project.",
 )
-async def create_project_task_route(
+def create_project_task_route(
     project_id: int, task: schemas.TaskCreate, db: Session = Depends(get_db)
 ):
     task = crud.create_task(db, project_id, task)
     return task
 
 
+@router.post(
+    "/project/{project_id}/tasks:bulk",
+    response_model=schemas.TaskBulkResult,
+    tags=["Task"],
+    description="Creates many tasks in a project at once. Accepts a JSON array of "
+    "tasks, or one task per line with `Content-Type: application/x-ndjson`. "
+    "Returns the id or the validation error of every item. Each chunk of created "
+    "tasks is recorded as one `tasks.created` event with their ids.",
+)
+async def create_project_tasks_bulk_route(
+    project_id: int, request: Request, db: Session = Depends(get_db)
+):
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(ValueError("Invalid JSON"))
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a list of tasks")
+    # treść requestu czyta się asynchronicznie, a sam zapis idzie na pulę wątków
+    return await run_in_threadpool(
+        profiled(crud.bulk_create_tasks), db, project_id, items
+    )
+
+
 @router.get(
     "/project/{project_id}/task/{task_id}",
     response_model=schemas.Task,
     tags=["Task"],
     description="Returns a task in a project.",
 )
-async def read_project_task_route(
+def read_project_task_route(
     project_id: int, task_id: int, db: Session = Depends(get_db)
 ):
     task = crud.read_task(db, project_id, task_id)
@@ -98,11 +195,54 @@ async def read_project_task_route(
     "/project/{project_id}/tasks",
     response_model=list[schemas.Task],
     tags=["Task"],
-    description="Returns all tasks in a project.",
+    description="Returns all tasks in a project, or a page of `limit` tasks. If there "
+    "are more, the `X-Next-Cursor` header holds the `cursor` for the next page. "
+    "With `stream=true` or `Accept: application/x-ndjson` tasks are streamed one "
+    "JSON object per line. With `ids` returns exactly those tasks in the given "
+    "order (404 lists the missing ones).",
 )
-async def read_project_tasks_route(project_id: int, db: Session = Depends(get_db)):
-    tasks = crud.read_project_tasks(db, project_id)
-    return tasks
+def read_project_tasks_route(
+    project_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(default=None, gt=0),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    ids: Optional[list[int]] = Depends(query_ids),
+    db: Session = Depends(get_db),
+):
+    if ids is not None:
+        not_modified = check_etag(request, response, db, project_id)
+        if not_modified is not None:
+            return not_modified
+        return crud.read_tasks_by_ids(db, project_id, ids)
+    if wants_ndjson(request, stream):
+        return StreamingResponse(
+            crud.stream_project_tasks(project_id), media_type="application/x-ndjson"
+        )
+    not_modified = check_etag(request, response, db, project_id)
+    if not_modified is not None:
+        return not_modified
+    tasks, next_cursor = crud.read_project_tasks(db, project_id, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return fast_json(tasks, response)
+
+
+@router.post(
+    "/project/{project_id}/tasks:lookup",
+    response_model=list[schemas.Task],
+    tags=["Task"],
+    description="Same as `GET /project/{project_id}/tasks?ids=...` for lists too "
+    "long for a URL.",
+)
+def lookup_project_tasks_route(
+    project_id: int,
+    lookup: schemas.IdsLookup,
+    db: Session = Depends(get_db),
+):
+    ids = list(dict.fromkeys(lookup.ids))
+    return crud.read_tasks_by_ids(db, project_id, ids)
 
 
 @router.delete(
@@ -110,7 +250,7 @@ async def read_project_tasks_route(project_id: int, db: Session = Depends(get_db
     tags=["Task"],
     description="Deletes a task in a project.",
 )
-async def delete_project_task_route(
+def delete_project_task_route(
     project_id: int, task_id: int, db: Session = Depends(get_db)
 ):
     crud.delete_task(db, project_id, task_id)
@@ -121,25 +261,100 @@ async def delete_project_task_route(
     "/project/{project_id}/assignment",
     response_model=schemas.Assignment,
     tags=["Assignment"],
-    description="Creates an assignment (proposition of developer to assign to tasks).",
+    description="Creates an assignment (proposition of developer to assign to tasks). "
+    "`strategy=optimal` solves it as a min-cost assignment with at most `capacity` "
+    "tasks per developer; `greedy` stops giving tasks to a developer at `capacity`. "
+    "With `incremental=true` the latest not yet accepted "
+    "assignment is updated instead: only tasks affected by changes since it was "
+    "planned are planned again.",
 )
-async def create_project_assignment_route(
-    project_id: int, db: Session = Depends(get_db)
+def create_project_assignment_route(
+    project_id: int,
+    strategy: schemas.AssignmentStrategy = schemas.AssignmentStrategy.GREEDY,
+    capacity: Optional[int] = Query(default=None, gt=0),
+    incremental: bool = False,
+    db: Session = Depends(get_db),
 ):
-    result = crud.create_assignment(db, project_id)
+    result = crud.create_assignment(
+        db, project_id, strategy.value, capacity, incremental
+    )
     return result
 
 
+@router.post(
+    "/assignments:batch",
+    response_model=schemas.AssignmentBatch,
+    tags=["Assignment"],
+    description="Creates an assignment for each of `project_ids` (all projects "
+    "when omitted) that has tasks with state NOT_ASSIGNED. Tasks, members and "
+    "history of all projects are loaded together and a developer's load is shared "
+    "between the projects they belong to. The default strategy is `optimal`, which "
+    "limits the tasks of every developer across the projects; `greedy` does that "
+    "only with `capacity`. Projects with nothing to assign are listed in "
+    "`skipped_project_ids`.",
+)
+def create_assignments_batch_route(
+    batch: schemas.AssignmentBatchCreate,
+    strategy: schemas.AssignmentStrategy = schemas.AssignmentStrategy.OPTIMAL,
+    capacity: Optional[int] = Query(default=None, gt=0),
+    db: Session = Depends(get_db),
+):
+    result = crud.create_assignments_batch(
+        db, batch.project_ids, strategy.value, capacity
+    )
+    return result
+
+
+@router.post(
+    "/project/{project_id}/assignment/job",
+    response_model=schemas.AssignmentJob,
+    status_code=202,
+    tags=["Assignment"],
+    description="Queues an assignment to be created in the background. "
+    "Poll the returned job for its state and the resulting assignment.",
+)
+async def create_project_assignment_job_route(
+    project_id: int,
+    strategy: schemas.AssignmentStrategy = schemas.AssignmentStrategy.GREEDY,
+    capacity: Optional[int] = Query(default=None, gt=0),
+    incremental: bool = False,
+):
+    return jobs.submit_assignment_job(project_id, strategy.value, capacity, incremental)
+
+
+@router.get(
+    "/project/{project_id}/assignment/job/{job_id}",
+    response_model=schemas.AssignmentJob,
+    tags=["Assignment"],
+    description="Returns the state of a background assignment job.",
+)
+async def read_project_assignment_job_route(project_id: int, job_id: str):
+    return jobs.read_assignment_job(project_id, job_id)
+
+
 @router.get(
     "/project/{project_id}/assignment/{assignment_id}",
-    response_model=schemas.Assignment,
+    response_model=schemas.ExpandedAssignment,
+    response_model_exclude_unset=True,
     tags=["Assignment"],
-    description="Get an assignment in a project.",
+    description="Get an assignment in a project. Responds with 304 when "
+    "`If-None-Match` matches the current `ETag`. `expand=developers,tasks` adds "
+    "the developers and tasks of the proposed changes.",
 )
-async def read_project_assignment_route(
-    project_id: int, assignment_id: int, db: Session = Depends(get_db)
+def read_project_assignment_route(
+    project_id: int,
+    assignment_id: int,
+    request: Request,
+    response: Response,
+    expand: set[schemas.AssignmentExpand] = Depends(query_expand),
+    db: Session = Depends(get_db),
 ):
-    result = crud.read_assignment(db, project_id, assignment_id)
+    # zmiana developera nie podbija wersji projektu, więc bez ETag
+    if schemas.AssignmentExpand.DEVELOPERS not in expand:
+        not_modified = check_etag(request, response, db, project_id)
+        if not_modified is not None:
+            return not_modified
+    result = crud.read_assignment(db, project_id, assignment_id, expand)
     return result
 
 
@@ -148,7 +363,7 @@ async def read_project_assignment_route(
     tags=["Assignment"],
     description="Edits an assignment in a project.",
 )
-async def update_assignment_route(
+def update_assignment_route(
     project_id: int,
     assignment_id: int,
     assignment: schemas.AssignmentUpdate,
@@ -163,7 +378,7 @@ async def update_assignment_route(
     tags=["Assignment"],
     description="Deletes an assignment in a project.",
 )
-async def delete_project_assignment_route(
+def delete_project_assignment_route(
     project_id: int, assignment_id: int, db: Session = Depends(get_db)
 ):
     crud.delete_assignment(db, project_id, assignment_id)
@@ -173,13 +388,48 @@ async def delete_project_assignment_route(
 @router.get(
     "/project/{project_id}/assignments",
     tags=["Assignment"],
-    description="Returns all assignments in project.",
-    response_model=list[schemas.Assignment]
+    description="Returns all assignments in project. If there are more, the "
+    "`X-Next-Cursor` header holds the `cursor` for the next page. With `stream=true` "
+    "or `Accept: application/x-ndjson` assignments are streamed one JSON object per "
+    "line. `expand=developers,tasks` adds the developers and tasks of the proposed "
+    "changes to each assignment.",
+    response_model=list[schemas.ExpandedAssignment],
+    response_model_exclude_unset=True,
 )
-async def read_project_assignments_route(
-    project_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+def read_project_assignments_route(
+    project_id: int,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(default=100, gt=0),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    expand: set[schemas.AssignmentExpand] = Depends(query_expand),
+    db: Session = Depends(get_db),
 ):
-    return crud.read_project_assignments(db, project_id)
+    if wants_ndjson(request, stream):
+        if not crud.project_has_assignments(db, project_id):
+            raise HTTPException(
+                status_code=404, detail="There are no assignments in this project."
+            )
+        return StreamingResponse(
+            crud.stream_project_assignments(project_id),
+            media_type="application/x-ndjson",
+        )
+    # zmiana developera nie podbija wersji projektu, więc bez ETag
+    if schemas.AssignmentExpand.DEVELOPERS not in expand:
+        not_modified = check_etag(request, response, db, project_id)
+        if not_modified is not None:
+            return not_modified
+    assignments, next_cursor = crud.read_project_assignments(
+        db, project_id, skip, limit, cursor, expand
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if expand:
+        # developerzy i taski jako modele - zwykła ścieżka przez response_model
+        return assignments
+    return fast_json(assignments, response)
 
 
 @router.put(
@@ -187,7 +437,7 @@ async def read_project_assignments_route(
     tags=["Task"],
     description="Edits a task in a project.",
 )
-async def update_project_task_route(
+def update_project_task_route(
     project_id: int,
     task_id: int,
     task: schemas.TaskUpdate,
@@ -198,6 +448,6 @@ async def update_project_task_route(
 
 
 @router.delete("/project/{id}", tags=["Project"], description="Deletes a project.")
-async def delete_project_route(id: int, db: Session = Depends(get_db)):
+def delete_project_route(id: int, db: Session = Depends(get_db)):
     crud.delete_project(db, id)
     return Response(status_code=200)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator, Field
 from enum import Enum
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 
@@ -17,6 +17,34 @@ class TaskState(str, Enum):
     NOT_ASSIGNED = "NOT_ASSIGNED"
 
 
+class AssignmentStrategy(str, Enum):
+    GREEDY = "greedy"
+    OPTIMAL = "optimal"
+
+
+class TaskEventType(str, Enum):
+    TASK_CREATED = "task.created"
+    # import przez tasks:bulk - jedno zdarzenie na kawałek, z listą id tasków
+    TASKS_CREATED = "tasks.created"
+    TASK_UPDATED = "task.updated"
+    TASK_DELETED = "task.deleted"
+    ASSIGNMENT_ACCEPTED = "assignment.accepted"
+    ASSIGNMENT_REJECTED = "assignment.rejected"
+    PROJECT_DEVELOPERS_CHANGED = "project.developers_changed"
+
+
+class AssignmentExpand(str, Enum):
+    DEVELOPERS = "developers"
+    TASKS = "tasks"
+
+
+class AssignmentJobState(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
 class Developer(BaseModel):
     id: int
     first_name: str
@@ -45,8 +73,8 @@ class Task(BaseModel):
     estimation: int
     specialization: Specialization
     developer_id: Optional[int] = Field(default=None)
-    date_assigned: datetime = Field(default=None)
-    date_completed: datetime = Field(default = None)
+    datetime_assigned: Optional[datetime] = Field(default=None)
+    datetime_completed: Optional[datetime] = Field(default=None)
 
 
 class TaskCreate(BaseModel):
@@ -73,6 +101,19 @@ class TaskCreate(BaseModel):
             n2 = value
 
 
+class TaskBulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+
+
+class TaskBulkResult(BaseModel):
+    created: int
+    failed: int
+    tasks_per_second: float
+    results: list[TaskBulkItemResult]
+
+
 class TaskUpdate(BaseModel):
     name: str = Field(default=None)
     project_id: int = Field(default=None)
@@ -80,8 +121,8 @@ class TaskUpdate(BaseModel):
     estimation: int = Field(default=None)
     specialization: Specialization = Field(default=None)
     developer_id: int = Field(default=None)
-    date_assigned: int = Field(default=None)
-    date_completed: int = Field(default=None)
+    datetime_assigned: datetime = Field(default=None)
+    datetime_completed: datetime = Field(default=None)
 
 
 class Project(BaseModel):
@@ -111,3 +152,73 @@ class Assignment(BaseModel):
     changes: dict[int, list[int]]
 
 
+class ExpandedAssignment(Assignment):
+    # tylko z ?expand=..., bez niego pól nie ma w odpowiedzi
+    developers: Optional[list[Developer]] = Field(default=None)
+    tasks: Optional[list[Task]] = Field(default=None)
+
+
+class IdsLookup(BaseModel):
+    ids: list[int] = Field(max_length=10_000)
+
+
+class AssignmentBatchCreate(BaseModel):
+    project_ids: Optional[list[int]] = Field(default=None)
+
+
+class ProjectAssignment(Assignment):
+    project_id: int
+
+
+class AssignmentBatch(BaseModel):
+    assignments: list[ProjectAssignment]
+    skipped_project_ids: list[int]
+
+
+class AssignmentJob(BaseModel):
+    id: str
+    project_id: int
+    state: AssignmentJobState
+    assignment: Optional[Assignment] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+
+
+class WorkloadStats(BaseModel):
+    tasks: int
+    estimation: int
+
+
+class WeeklyClosedStats(BaseModel):
+    week: date
+    closed: int
+
+
+class CycleTimeStats(BaseModel):
+    specialization: Specialization
+    estimation: int
+    closed: int
+    average_seconds: float
+
+
+class DeveloperStats(BaseModel):
+    developer_id: int
+    in_progress: WorkloadStats
+    closed_per_week: list[WeeklyClosedStats]
+    cycle_time: list[CycleTimeStats]
+
+
+class ProjectStats(BaseModel):
+    project_id: int
+    not_assigned: WorkloadStats
+    in_progress: WorkloadStats
+    closed_per_week: list[WeeklyClosedStats]
+    cycle_time: list[CycleTimeStats]
+
+
+class TaskEvent(BaseModel):
+    id: int
+    type: TaskEventType
+    project_id: int
+    task_id: Optional[int] = Field(default=None)
+    created_at: datetime
+    data: dict
@@ -0,0 +1,56 @@
+"""Uruchomienie produkcyjne: migracja bazy raz, a potem workery uvicorna bez
+`--reload` i bez obserwowania plików.
+
+    python -m app.serve --host 0.0.0.0 --port 8000
+
+Migracja idzie tylko tutaj, przed startem workerów, więc kilka procesów nie
+tworzy naraz tabel w tym samym pliku SQLite. Workery przy starcie tylko
+sprawdzają schemat i zgłaszają gotowość pod `GET /health/ready`.
+"""
+
+import argparse
+import os
+import uvicorn
+from dotenv import load_dotenv
+from .database import engine
+from .migrations import migrate
+
+load_dotenv()
+# ta sama zmienna co w gunicornie i wielu platformach hostingowych. Domyślnie
+# jeden proces: zadania przydziału w tle (app.jobs) są w pamięci procesu, więc
+# przy kilku workerach odpytanie trafiające do innego niż ten, który przyjął
+# zadanie, dostaje 404
+WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument(
+        "--no-access-log",
+        action="store_true",
+        help="do not log every request (saves CPU under load)",
+    )
+    args = parser.parse_args(argv)
+
+    migrate(engine)
+    # połączenia tego procesu nie są potrzebne workerom
+    engine.dispose()
+    # workery startują jako nowe procesy i dziedziczą środowisko
+    os.environ["DATABASE_AUTO_MIGRATE"] = "false"
+    # z tego pula przydziałów (app.assignment.batch) dzieli CPU między workery
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=False,
+        access_log=not args.no_access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
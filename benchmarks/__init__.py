@@ -0,0 +1,5 @@
+"""Benchmarki. Każdy moduł uruchamia się osobno: `python -m benchmarks.<nazwa>`.
+
+`benchmarks.suite` to zestaw scenariuszy z wynikami w JSON (do porównań między
+commitami), a `benchmarks.synthetic` generuje dla niego powtarzalne dane.
+"""
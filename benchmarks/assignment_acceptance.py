@@ -0,0 +1,120 @@
+"""Akceptacja przydziału: update_task dla każdej zmiany (jak wcześniej) kontra
+jedno UPDATE ... FROM proposed_change w update_assignment.
+
+Liczy transakcje (COMMIT) i zapytania przypadające na jedną akceptację.
+Baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.assignment_acceptance
+"""
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import create_db_engine
+
+
+def prepare(db, task_count):
+    project = models.Project(developer_owner_id=1, name="p")
+    db.add(project)
+    db.flush()
+    db.execute(
+        insert(models.Task.__table__),
+        [
+            {
+                "name": "t",
+                "project_id": project.id,
+                "estimation": 3,
+                "specialization": "BACKEND",
+            }
+            for _ in range(task_count)
+        ],
+    )
+    assignment = models.Assignment(project_id=project.id)
+    db.add(assignment)
+    db.flush()
+    task_ids = [t.id for t in db.query(models.Task.id).filter_by(project_id=project.id)]
+    db.execute(
+        insert(models.ProposedChange.__table__),
+        [
+            {"assignment_id": assignment.id, "developer_id": 1, "task_id": task_id}
+            for task_id in task_ids
+        ],
+    )
+    db.commit()
+    return project.id, assignment.id
+
+
+def accept_per_change(db, project_id, assignment_id):
+    changes = db.query(models.ProposedChange).filter_by(assignment_id=assignment_id)
+    for change in changes.all():
+        crud.update_task(
+            db,
+            project_id,
+            change.task_id,
+            schemas.TaskUpdate(
+                developer_id=change.developer_id,
+                datetime_assigned=datetime.utcnow(),
+                state="IN_PROGRESS",
+            ),
+        )
+
+
+def accept_set_based(db, project_id, assignment_id):
+    crud.update_assignment(
+        db, project_id, assignment_id, schemas.AssignmentUpdate(accepted=True)
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        counters = {"commits": 0, "statements": 0}
+
+        @event.listens_for(engine, "commit")
+        def count_commit(connection):
+            counters["commits"] += 1
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(*args):
+            counters["statements"] += 1
+
+        Session = sessionmaker(bind=engine)
+        print(
+            f"{'tasks':>6} {'method':>11} {'total ms':>10} "
+            f"{'commits':>8} {'statements':>11}"
+        )
+        for task_count in [100, 1_000, 5_000]:
+            for name, accept in [
+                ("per change", accept_per_change),
+                ("set based", accept_set_based),
+            ]:
+                db = Session()
+                project_id, assignment_id = prepare(db, task_count)
+                counters.update(commits=0, statements=0)
+                start = time.perf_counter()
+                accept(db, project_id, assignment_id)
+                elapsed = time.perf_counter() - start
+                assigned = (
+                    db.query(models.Task)
+                    .filter_by(project_id=project_id, state="IN_PROGRESS")
+                    .filter(models.Task.datetime_assigned.is_not(None))
+                    .count()
+                )
+                assert assigned == task_count
+                db.close()
+                print(
+                    f"{task_count:>6} {name:>11} {elapsed * 1000:>10.1f} "
+                    f"{counters['commits']:>8} {counters['statements']:>11}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
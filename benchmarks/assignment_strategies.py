@@ -0,0 +1,106 @@
+"""Porównanie strategii przydziału (greedy vs optimal): czas działania i makespan.
+
+Makespan to największa suma oczekiwanych czasów (średnie historyczne z
+`build_cost_matrix`) zadań przydzielonych jednemu developerowi. Historia z `benchmarks.synthetic`
+w bazie w pliku tymczasowym, statystyki z `crud.read_completion_stats`.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.assignment_strategies
+"""
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.assignment import SPECIALIZATIONS, get_strategy
+from app.assignment.optimal import build_cost_matrix
+from app.database import create_db_engine
+from benchmarks.synthetic import ESTIMATIONS
+from benchmarks.synthetic import generate as generate_history
+
+
+def generate(engine, task_count, developer_count, history_per_developer=20, seed=0):
+    # historia w jednym projekcie ze wszystkimi developerami, a statystyki z
+    # `crud.read_completion_stats` - tak jak przy przydziale w aplikacji
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    generate_history(
+        engine,
+        developers=developer_count,
+        projects=1,
+        tasks=history_per_developer * developer_count,
+        members_per_project=developer_count,
+        closed_ratio=1.0,
+        in_progress_ratio=0.0,
+        seed=seed,
+    )
+    with sessionmaker(bind=engine)() as db:
+        developers = [
+            SimpleNamespace(id=developer_id, specialization=specialization)
+            for developer_id, specialization in db.execute(
+                select(models.Developer.id, models.Developer.specialization)
+            )
+        ]
+        completion_stats = crud.read_completion_stats(db, [1]).get(1, {})
+    rng = random.Random(seed)
+    tasks = [
+        SimpleNamespace(
+            id=i,
+            estimation=rng.choice(ESTIMATIONS),
+            specialization=rng.choice(SPECIALIZATIONS),
+        )
+        for i in range(task_count)
+    ]
+    return tasks, developers, completion_stats
+
+
+def makespan(assignments, developers, completion_stats):
+    developer_ids = [d.id for d in developers]
+    cost = build_cost_matrix(developer_ids, ESTIMATIONS, completion_stats)
+    column = {developer_id: i for i, developer_id in enumerate(developer_ids)}
+    row = {estimation: i for i, estimation in enumerate(ESTIMATIONS)}
+    loads = [
+        sum(cost[row[t.estimation], column[developer_id]] for t in tasks)
+        for developer_id, tasks in assignments.items()
+    ]
+    return max(loads, default=0.0) / 3600
+
+
+def run(strategy, tasks, developers, completion_stats):
+    planner = get_strategy(strategy)
+    start = time.perf_counter()
+    assignments = planner.plan(tasks, developers, completion_stats)
+    elapsed = time.perf_counter() - start
+    return elapsed, makespan(assignments, developers, completion_stats)
+
+
+def main():
+    print(
+        f"{'tasks':>8} {'devs':>6} {'strategy':>9} {'total ms':>10} {'makespan h':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        for task_count, developer_count in [
+            (100, 8),
+            (1_000, 40),
+            (5_000, 100),
+        ]:
+            tasks, developers, completion_stats = generate(
+                engine, task_count, developer_count
+            )
+            for strategy in ["greedy", "optimal"]:
+                elapsed, span = run(strategy, tasks, developers, completion_stats)
+                print(
+                    f"{task_count:>8} {developer_count:>6} {strategy:>9} "
+                    f"{elapsed * 1000:>10.2f} {span:>11.1f}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
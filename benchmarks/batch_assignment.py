@@ -0,0 +1,67 @@
+"""Przydział dla całej organizacji: osobne `create_assignment` dla każdego
+projektu kontra jedno `create_assignments_batch`.
+
+Dane z `benchmarks.synthetic`; liczy czas i zapytania do bazy. Batch planuje
+równolegle tylko grupy projektów bez wspólnych developerów - liczbę procesów
+ustawia ASSIGNMENT_BATCH_WORKERS. Baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.batch_assignment
+"""
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.assignment.batch import BATCH_WORKERS
+from benchmarks.synthetic import generate
+from app.database import create_db_engine
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+        print(f"workers={BATCH_WORKERS}")
+        print(f"{'projects':>8} {'tasks':>7} {'method':>10} {'ms':>9} {'queries':>8}")
+        for projects, tasks in [(20, 10_000), (100, 50_000)]:
+            models.Base.metadata.drop_all(bind=engine)
+            models.Base.metadata.create_all(bind=engine)
+            generate(
+                engine,
+                developers=200,
+                projects=projects,
+                tasks=tasks,
+                members_per_project=10,
+                closed_ratio=0.6,
+                in_progress_ratio=0.0,
+            )
+            db = sessionmaker(bind=engine)()
+            for method in ["per-project", "batch"]:
+                # za każdym razem ten sam zimny cache developerów i składów
+                crud.cache.developers.clear()
+                crud.cache.project_developers.clear()
+                statements.clear()
+                start = time.perf_counter()
+                if method == "batch":
+                    # ta sama strategia co create_assignment
+                    crud.create_assignments_batch(db, strategy="greedy")
+                else:
+                    for project_id in range(1, projects + 1):
+                        crud.create_assignment(db, project_id)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{projects:>8} {tasks:>7} {method:>10} "
+                    f"{elapsed * 1000:>9.1f} {len(statements):>8}"
+                )
+            db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
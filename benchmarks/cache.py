@@ -0,0 +1,96 @@
+"""Liczba zapytań do bazy przy ruchu złożonym głównie z odczytów, z cache
+developerów i członkostwa w projektach oraz bez niego (maxsize=0).
+
+Aplikacja działa na bazie w pliku tymczasowym (DATABASE_URL ustawiany przed
+importem), a requesty idą przez TestClient.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.cache
+"""
+
+import os
+import random
+import tempfile
+import time
+
+directory = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import cache  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+DEVELOPERS = 200
+PROJECTS = 100
+REQUESTS = 3000
+SPECIALIZATIONS = ["FRONTEND", "BACKEND", "UX/UI", "DEVOPS"]
+
+
+def seed(client, rng):
+    for i in range(DEVELOPERS):
+        client.post(
+            "/developer",
+            json={
+                "first_name": "a",
+                "last_name": str(i),
+                "specialization": SPECIALIZATIONS[i % 4],
+            },
+        )
+    for i in range(PROJECTS):
+        client.post(
+            "/project",
+            json={
+                "name": f"p{i}",
+                "developer_owner_id": rng.randint(1, DEVELOPERS),
+                "developers": rng.sample(range(1, DEVELOPERS + 1), 8),
+            },
+        )
+
+
+def run(client, rng):
+    for i in range(REQUESTS):
+        roll = rng.random()
+        if roll < 0.4:
+            client.get(f"/project/{rng.randint(1, PROJECTS)}")
+        elif roll < 0.8:
+            client.get(f"/developer/{rng.randint(1, DEVELOPERS)}")
+        elif roll < 0.95:
+            client.get(f"/projects?limit=20&skip={rng.randint(0, PROJECTS - 20)}")
+        else:
+            # rzadkie zapisy unieważniają wpisy
+            developer_id = rng.randint(1, DEVELOPERS)
+            client.put(f"/developer/{developer_id}", json={"first_name": str(i)})
+
+
+def main():
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(1),
+    )
+    with TestClient(app) as client:
+        seed(client, random.Random(0))
+        print(f"{'cache':>6} {'queries':>8} {'per req':>8} {'total ms':>9}")
+        for enabled in [False, True]:
+            for c in (cache.developers, cache.project_developers):
+                c.clear()
+                c.maxsize = cache.CACHE_MAX_ENTRIES if enabled else 0
+            statements.clear()
+            start = time.perf_counter()
+            run(client, random.Random(1))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{'on' if enabled else 'off':>6} {len(statements):>8} "
+                f"{len(statements) / REQUESTS:>8.2f} {elapsed * 1000:>9.0f}"
+            )
+        for stats in client.get("/cache/stats").json():
+            print(stats)
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
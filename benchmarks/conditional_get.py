@@ -0,0 +1,105 @@
+"""Odpytywanie projektu, jego tasków i przydziału tak jak robią to dashboardy:
+bez nagłówka If-None-Match oraz z ETagiem z poprzedniej odpowiedzi. Liczy
+zapytania do bazy i bajty odpowiedzi; co 50. odpytanie projekt się zmienia.
+
+Aplikacja działa na bazie w pliku tymczasowym (DATABASE_URL ustawiany przed
+importem), a requesty idą przez TestClient.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.conditional_get
+"""
+
+import os
+import tempfile
+import time
+
+directory = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+TASKS = 500
+POLLS = 300
+CHANGE_EVERY = 50
+SPECIALIZATIONS = ["FRONTEND", "BACKEND", "UX/UI", "DEVOPS"]
+
+
+def seed(client):
+    for i in range(8):
+        client.post(
+            "/developer",
+            json={
+                "first_name": "a",
+                "last_name": str(i),
+                "specialization": SPECIALIZATIONS[i % 4],
+            },
+        )
+    client.post(
+        "/project",
+        json={"name": "p", "developer_owner_id": 1, "developers": list(range(1, 9))},
+    )
+    client.post(
+        "/project/1/tasks:bulk",
+        json=[
+            {"name": "t", "estimation": 3, "specialization": SPECIALIZATIONS[i % 4]}
+            for i in range(TASKS)
+        ],
+    )
+    return client.post("/project/1/assignment").json()["id"]
+
+
+def poll(client, urls, conditional, counters):
+    etags = {}
+    for i in range(POLLS):
+        if i and i % CHANGE_EVERY == 0:
+            client.post(
+                "/project/1/task",
+                json={"name": "t", "estimation": 3, "specialization": "BACKEND"},
+            )
+        for url in urls:
+            headers = (
+                {"If-None-Match": etags[url]} if conditional and url in etags else {}
+            )
+            response = client.get(url, headers=headers)
+            etags[url] = response.headers["ETag"]
+            counters["bytes"] += len(response.content)
+            counters["not modified"] += response.status_code == 304
+
+
+def main():
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(1),
+    )
+    with TestClient(app) as client:
+        assignment_id = seed(client)
+        urls = [
+            "/project/1",
+            "/project/1/tasks",
+            f"/project/1/assignment/{assignment_id}",
+        ]
+        print(
+            f"{'If-None-Match':>14} {'queries':>8} {'KiB':>8} {'304':>5} {'total ms':>9}"
+        )
+        for conditional in [False, True]:
+            counters = {"bytes": 0, "not modified": 0}
+            statements.clear()
+            start = time.perf_counter()
+            poll(client, urls, conditional, counters)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{'yes' if conditional else 'no':>14} {len(statements):>8} "
+                f"{counters['bytes'] / 1024:>8.0f} {counters['not modified']:>5} "
+                f"{elapsed * 1000:>9.0f}"
+            )
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Dziennik zdarzeń (`GET /events`): odczyt kolejnej strony przy rosnącym
+dzienniku i czas od commitu zmiany do obudzenia czekającego long polla.
+
+Odczyt po numerze (i projekcie) idzie po kluczu głównym albo indeksie, więc
+powinien mieć stały czas. Obudzenie w tym samym procesie przychodzi zaraz po
+commicie, a nie po `EVENTS_POLL_SECONDS`. Baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.event_feed
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app import events, models, schemas
+from app.database import create_db_engine
+
+ROUNDS = 50
+PROJECTS = 20
+
+
+def fill(session_factory, count):
+    with session_factory() as db:
+        events.record(
+            db,
+            [
+                events.new_event(
+                    schemas.TaskEventType.TASK_UPDATED,
+                    i % PROJECTS + 1,
+                    i,
+                    changed=["state"],
+                )
+                for i in range(count)
+            ],
+        )
+        db.commit()
+
+
+def timed(function, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+async def wakeup_ms(session_factory):
+    # commit w wątku (jak w crud) i czas do obudzenia czekającego w pętli
+    loop = asyncio.get_running_loop()
+    total = 0.0
+    for _ in range(ROUNDS):
+        generation = events.notifier.generation
+        waiting = asyncio.ensure_future(events.notifier.wait(generation, 5))
+        await asyncio.sleep(0)
+        committed = await loop.run_in_executor(None, commit_event, session_factory)
+        await waiting
+        total += time.perf_counter() - committed
+    return total * 1000 / ROUNDS
+
+
+def commit_event(session_factory):
+    with session_factory() as db:
+        events.record(db, [events.new_event(schemas.TaskEventType.TASK_DELETED, 1, 1)])
+        db.commit()
+        return time.perf_counter()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        print(f"{'events':>8} {'page ms':>8} {'project page ms':>16} {'insert us':>10}")
+        total = 0
+        for count in [10_000, 100_000, 1_000_000]:
+            start = time.perf_counter()
+            fill(session_factory, count - total)
+            insert = (time.perf_counter() - start) * 1_000_000 / (count - total)
+            total = count
+            db = session_factory()
+            page = timed(lambda: events.read(db, total - 100, 100))
+            project_page = timed(lambda: events.read(db, total - 2000, 100, 1))
+            db.close()
+            print(f"{count:>8} {page:>8.2f} {project_page:>16.2f} {insert:>10.1f}")
+        wakeup = asyncio.run(wakeup_ms(session_factory))
+        print(
+            f"commit -> long poll wakeup: {wakeup:.2f} ms "
+            f"(polling fallback: {events.POLL_SECONDS * 1000:.0f} ms)"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
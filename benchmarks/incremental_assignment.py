@@ -0,0 +1,105 @@
+"""Przeplanowanie przydziału dużego projektu, w którym od ostatniego planu
+doszło kilka tasków i jeden się zmienił: nowy przydział od zera kontra
+`incremental=True` (zmiana istniejącego przydziału).
+
+Dane z `benchmarks.synthetic`, jeden projekt; liczy czas, zapytania i zapisane
+wiersze proposed_change na przeplanowanie. Baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.incremental_assignment
+"""
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import create_db_engine
+from benchmarks.synthetic import SPECIALIZATIONS, generate
+
+ROUNDS = 10
+NEW_TASKS_PER_ROUND = 3
+
+
+def change_backlog(db, rng, project_id):
+    for _ in range(NEW_TASKS_PER_ROUND):
+        crud.create_task(
+            db,
+            project_id,
+            schemas.TaskCreate(
+                name="new",
+                estimation=rng.choice([3, 5, 8]),
+                specialization=rng.choice(SPECIALIZATIONS),
+            ),
+        )
+    task = (
+        db.query(models.Task)
+        .filter_by(project_id=project_id, state="NOT_ASSIGNED")
+        .order_by(models.Task.id)
+        .offset(rng.randint(0, 100))
+        .first()
+    )
+    crud.update_task(db, project_id, task.id, schemas.TaskUpdate(name=f"{task.name}*"))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        # liczone tylko w trakcie samego przeplanowania, bez zmian w backlogu
+        counters = {"measuring": False, "statements": 0, "rows": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, parameters, *args):
+            if not counters["measuring"]:
+                return
+            counters["statements"] += 1
+            if statement.startswith("INSERT INTO proposed_change"):
+                counters["rows"] += (
+                    len(parameters) if isinstance(parameters, list) else 1
+                )
+
+        print(
+            f"{'backlog':>8} {'method':>12} {'ms/replan':>10} "
+            f"{'queries':>8} {'rows':>6}"
+        )
+        for tasks in [2_000, 10_000, 30_000]:
+            models.Base.metadata.drop_all(bind=engine)
+            models.Base.metadata.create_all(bind=engine)
+            generate(
+                engine,
+                developers=40,
+                projects=1,
+                tasks=tasks,
+                members_per_project=40,
+                closed_ratio=0.4,
+                in_progress_ratio=0.0,
+            )
+            db = sessionmaker(bind=engine)()
+            backlog = db.query(models.Task).filter_by(state="NOT_ASSIGNED").count()
+            for incremental in [False, True]:
+                rng = random.Random(0)
+                crud.create_assignment(db, 1)
+                counters.update(statements=0, rows=0)
+                elapsed = 0.0
+                for _ in range(ROUNDS):
+                    change_backlog(db, rng, 1)
+                    counters["measuring"] = True
+                    start = time.perf_counter()
+                    crud.create_assignment(db, 1, incremental=incremental)
+                    elapsed += time.perf_counter() - start
+                    counters["measuring"] = False
+                print(
+                    f"{backlog:>8} {'incremental' if incremental else 'full':>12} "
+                    f"{elapsed * 1000 / ROUNDS:>10.1f} "
+                    f"{counters['statements'] / ROUNDS:>8.0f} "
+                    f"{counters['rows'] / ROUNDS:>6.0f}"
+                )
+            db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Czas rozdzielania zadań bez danych historycznych (balance_leftover_tasks).
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.leftover_balancing
+"""
+import random
+import time
+from types import SimpleNamespace
+
+from app.assignment import balance_leftover_tasks
+
+ESTIMATIONS = [1, 2, 3, 5, 8, 13, 21]
+
+
+def run(task_count, developer_count, seed=0):
+    rng = random.Random(seed)
+    tasks = [
+        SimpleNamespace(id=i, estimation=rng.choice(ESTIMATIONS))
+        for i in range(task_count)
+    ]
+    developer_ids = list(range(1, developer_count + 1))
+    totals = {developer_id: 0 for developer_id in developer_ids}
+    start = time.perf_counter()
+    placed = sum(1 for _ in balance_leftover_tasks(tasks, developer_ids, totals))
+    elapsed = time.perf_counter() - start
+    return placed, elapsed, max(totals.values()) - min(totals.values())
+
+
+def main():
+    print(f"{'tasks':>8} {'devs':>6} {'total ms':>10} {'us/task':>9} {'spread':>7}")
+    for task_count, developer_count in [
+        (1_000, 50),
+        (10_000, 50),
+        (10_000, 500),
+        (100_000, 500),
+    ]:
+        placed, elapsed, spread = run(task_count, developer_count)
+        print(
+            f"{placed:>8} {developer_count:>6} {elapsed * 1000:>10.2f} "
+            f"{elapsed / placed * 1e6:>9.3f} {spread:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Opóźnienia przy 200 równoczesnych klientach: sesja synchroniczna w `async def`
+(jak było wcześniej), trasy `def` na puli wątków (tak działa aplikacja) i
+AsyncSession z `run_sync`.
+
+Wszystkie aplikacje mają te same trasy i tę samą bazę w pliku tymczasowym,
+działają w uvicornie w osobnym procesie. Klienci naprzemiennie czytają projekt
+i dodają taski. Wariant z AsyncSession potrzebuje `aiosqlite`
+(`pip install aiosqlite`), którego aplikacja już nie używa.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.load_test
+"""
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI
+
+CLIENTS = 200
+# pula na każdego klienta w obu wariantach; przy domyślnych 5 + 10 połączeniach
+# wariant synchroniczny staje: czeka na połączenie, blokując pętlę, która mogłaby
+# je zwolnić
+os.environ.setdefault("DATABASE_POOL_SIZE", str(CLIENTS))
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud, models, schemas  # noqa: E402
+from app.database import (  # noqa: E402
+    MAX_OVERFLOW,
+    POOL_SIZE,
+    SQLITE_PRAGMAS,
+    create_db_engine,
+)
+
+REQUESTS_PER_CLIENT = 10
+PROJECTS = 20
+TASK = {"name": "t", "estimation": 3, "specialization": "BACKEND"}
+
+
+def create_async_db_engine(path):
+    """Silnik aiosqlite z tymi samymi pragmami i pulą co `create_db_engine`."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def build_apps(path):
+    engine = create_db_engine(f"sqlite:///{path}")
+    SessionLocal = sessionmaker(autoflush=False, bind=engine)
+    async_engine = create_async_db_engine(path)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    blocking = FastAPI()
+
+    @blocking.get("/project/{id}")
+    async def blocking_read(id: int, db: Session = Depends(get_db)):
+        return crud.read_project(db, id)
+
+    @blocking.post("/project/{project_id}/task", response_model=schemas.Task)
+    async def blocking_create(
+        project_id: int, task: schemas.TaskCreate, db: Session = Depends(get_db)
+    ):
+        return crud.create_task(db, project_id, task)
+
+    threadpool = FastAPI()
+
+    @threadpool.get("/project/{id}")
+    def threadpool_read(id: int, db: Session = Depends(get_db)):
+        return crud.read_project(db, id)
+
+    @threadpool.post("/project/{project_id}/task", response_model=schemas.Task)
+    def threadpool_create(
+        project_id: int, task: schemas.TaskCreate, db: Session = Depends(get_db)
+    ):
+        return crud.create_task(db, project_id, task)
+
+    native = FastAPI()
+
+    @native.get("/project/{id}")
+    async def native_read(id: int, db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(crud.read_project, id)
+
+    @native.post("/project/{project_id}/task", response_model=schemas.Task)
+    async def native_create(
+        project_id: int,
+        task: schemas.TaskCreate,
+        db: AsyncSession = Depends(get_async_db),
+    ):
+        return await db.run_sync(crud.create_task, project_id, task)
+
+    return {
+        "sync session": blocking,
+        "def + threadpool": threadpool,
+        "AsyncSession": native,
+    }
+
+
+def seed(path):
+    engine = create_db_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    developer = crud.create_developer(
+        db,
+        schemas.DeveloperCreate(
+            first_name="a", last_name="b", specialization="BACKEND"
+        ),
+    )
+    for i in range(PROJECTS):
+        crud.create_project(
+            db,
+            schemas.ProjectCreate(
+                name=f"p{i}", developer_owner_id=developer.id, developers=[]
+            ),
+        )
+    db.close()
+    engine.dispose()
+
+
+async def client(http, index, latencies, errors):
+    for i in range(REQUESTS_PER_CLIENT):
+        project_id = (index + i) % PROJECTS + 1
+        start = time.perf_counter()
+        try:
+            if i % 2:
+                response = await http.post(f"/project/{project_id}/task", json=TASK)
+            else:
+                response = await http.get(f"/project/{project_id}")
+        except httpx.TransportError:
+            # serwer z zablokowaną pętlą potrafi zerwać połączenie pod obciążeniem
+            errors.append(1)
+            continue
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def load(port):
+    latencies = []
+    errors = []
+    limits = httpx.Limits(max_connections=CLIENTS)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+    ) as http:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(client(http, i, latencies, errors) for i in range(CLIENTS))
+        )
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99)],
+        len(errors),
+    )
+
+
+def serve(path, name, port):
+    # serwer w osobnym procesie, żeby klienci nie dzielili z nim GIL-a
+    uvicorn.run(build_apps(path)[name], port=port, log_level="warning", backlog=4096)
+
+
+def wait_for(port):
+    while True:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/project/1")
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        seed(path)
+        print(f"{'session':>16} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for port, name in enumerate(
+            ["sync session", "def + threadpool", "AsyncSession"], start=8765
+        ):
+            server = multiprocessing.Process(target=serve, args=(path, name, port))
+            server.start()
+            wait_for(port)
+            throughput, p50, p99, errors = asyncio.run(load(port))
+            server.terminate()
+            server.join()
+            print(
+                f"{name:>16} {throughput:>8.0f} {p50 * 1000:>8.1f} "
+                f"{p99 * 1000:>8.1f} {errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
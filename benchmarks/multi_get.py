@@ -0,0 +1,120 @@
+"""Wyświetlenie przydziału ze wszystkimi developerami i taskami: request na
+każdy obiekt (`GET /developer/{id}`, `GET /project/{pid}/task/{tid}`), dwa
+requesty z `ids=...` albo jeden `GET .../assignment/{id}?expand=developers,tasks`.
+Liczy requesty, zapytania do bazy i czas.
+
+Aplikacja działa na bazie w pliku tymczasowym (DATABASE_URL ustawiany przed
+importem), a requesty idą przez TestClient, więc czas nie obejmuje sieci -
+w prawdziwym kliencie różnica rośnie o opóźnienie każdego requestu.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.multi_get
+"""
+
+import os
+import tempfile
+import time
+
+directory = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+DEVELOPERS = 30
+TASKS = 300
+ROUNDS = 5
+SPECIALIZATIONS = ["FRONTEND", "BACKEND", "UX/UI", "DEVOPS"]
+
+
+def seed(client):
+    for i in range(DEVELOPERS):
+        client.post(
+            "/developer",
+            json={
+                "first_name": "a",
+                "last_name": str(i),
+                "specialization": SPECIALIZATIONS[i % 4],
+            },
+        )
+    client.post(
+        "/project",
+        json={
+            "name": "p",
+            "developer_owner_id": 1,
+            "developers": list(range(1, DEVELOPERS + 1)),
+        },
+    )
+    client.post(
+        "/project/1/tasks:bulk",
+        json=[
+            {"name": "t", "estimation": 3, "specialization": SPECIALIZATIONS[i % 4]}
+            for i in range(TASKS)
+        ],
+    )
+    return client.post("/project/1/assignment").json()["id"]
+
+
+def one_by_one(client, assignment_id):
+    assignment = client.get(f"/project/1/assignment/{assignment_id}").json()
+    for developer_id, task_ids in assignment["changes"].items():
+        client.get(f"/developer/{developer_id}")
+        for task_id in task_ids:
+            client.get(f"/project/1/task/{task_id}")
+    return (
+        1
+        + len(assignment["changes"])
+        + sum(len(task_ids) for task_ids in assignment["changes"].values())
+    )
+
+
+def with_ids(client, assignment_id):
+    assignment = client.get(f"/project/1/assignment/{assignment_id}").json()
+    developer_ids = ",".join(assignment["changes"])
+    task_ids = ",".join(
+        str(task_id)
+        for task_ids in assignment["changes"].values()
+        for task_id in task_ids
+    )
+    client.get(f"/developers?ids={developer_ids}")
+    client.get(f"/project/1/tasks?ids={task_ids}")
+    return 3
+
+
+def expanded(client, assignment_id):
+    client.get(f"/project/1/assignment/{assignment_id}?expand=developers,tasks")
+    return 1
+
+
+def main():
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(1),
+    )
+    with TestClient(app) as client:
+        assignment_id = seed(client)
+        print(f"{'variant':>12} {'requests':>9} {'queries':>8} {'ms':>8}")
+        for name, render in [
+            ("one by one", one_by_one),
+            ("ids", with_ids),
+            ("expand", expanded),
+        ]:
+            statements.clear()
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                requests = render(client, assignment_id)
+            elapsed = (time.perf_counter() - start) * 1000 / ROUNDS
+            print(
+                f"{name:>12} {requests:>9} {len(statements) // ROUNDS:>8} "
+                f"{elapsed:>8.1f}"
+            )
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
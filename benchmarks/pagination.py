@@ -0,0 +1,71 @@
+"""Pobieranie strony developerów (m.in. 1000.): offset (`skip`) kontra kursor.
+
+Baza jest tworzona w pliku tymczasowym, nie rusza database/app.db.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.pagination
+"""
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+
+PAGE_SIZE = 100
+PAGES = [1, 100, 1000, 5000]
+DEVELOPERS = 600_000
+REPEATS = 20
+
+
+def best_of(fetch):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        rows, _ = fetch()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return rows, best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(models.Developer.__table__),
+                [
+                    {
+                        "first_name": "a",
+                        "last_name": str(i),
+                        "specialization": "BACKEND",
+                    }
+                    for i in range(DEVELOPERS)
+                ],
+            )
+        db = sessionmaker(bind=engine)()
+        print(f"{'page':>6} {'offset ms':>10} {'cursor ms':>10} {'speedup':>8}")
+        for page in PAGES:
+            skip = (page - 1) * PAGE_SIZE
+            by_offset, offset_time = best_of(
+                lambda: crud.read_developers(db, skip, PAGE_SIZE)
+            )
+            # kursor strony to id ostatniego developera poprzedniej strony
+            cursor = crud.encode_cursor(skip)
+            by_cursor, cursor_time = best_of(
+                lambda: crud.read_developers(db, 0, PAGE_SIZE, cursor)
+            )
+            assert [d.id for d in by_offset] == [d.id for d in by_cursor]
+            print(
+                f"{page:>6} {offset_time * 1000:>10.3f} "
+                f"{cursor_time * 1000:>10.3f} {offset_time / cursor_time:>7.1f}x"
+            )
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Zmiana składu dużego projektu: usunięcie wszystkich przypisań i dodawanie ich
+po jednym bez sprawdzania developerów (jak wcześniej w update_project) kontra
+update_project z walidacją jednym IN i zapisem różnicy.
+
+W każdej rundzie wymieniane jest 10% członków. Liczy zapytania i wiersze
+project_developer zapisane (INSERT) na jedną zmianę. Baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.project_membership
+"""
+
+import os
+import tempfile
+import time
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import cache, crud, models, schemas
+from app.database import create_db_engine
+
+ROUNDS = 20
+
+
+def update_full_rewrite(db, project_id, developer_ids):
+    db.query(models.ProjectDeveloper).filter(
+        models.ProjectDeveloper.project_id == project_id
+    ).delete()
+    for developer_id in dict.fromkeys(developer_ids):
+        db.add(
+            models.ProjectDeveloper(developer_id=developer_id, project_id=project_id)
+        )
+    db.commit()
+
+
+def update_diff(db, project_id, developer_ids):
+    crud.update_project(db, project_id, schemas.ProjectUpdate(developers=developer_ids))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        counters = {"statements": 0, "rows": 0}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, parameters, *args):
+            counters["statements"] += 1
+            if statement.startswith("INSERT INTO project_developer"):
+                # executemany dostaje listę wierszy, pojedynczy INSERT jedną krotkę
+                counters["rows"] += (
+                    len(parameters) if isinstance(parameters, list) else 1
+                )
+
+        Session = sessionmaker(bind=engine)
+        print(
+            f"{'members':>8} {'method':>13} {'ms/update':>10} "
+            f"{'queries':>8} {'rows':>6}"
+        )
+        for members in [100, 1_000, 5_000]:
+            db = Session()
+            db.execute(
+                insert(models.Developer.__table__),
+                [
+                    {"first_name": "a", "last_name": "b", "specialization": "BACKEND"}
+                    for _ in range(members * 2)
+                ],
+            )
+            db.commit()
+            for name, update in [
+                ("full rewrite", update_full_rewrite),
+                ("diff", update_diff),
+            ]:
+                project = crud.create_project(
+                    db,
+                    schemas.ProjectCreate(
+                        name="p",
+                        developer_owner_id=1,
+                        developers=list(range(1, members + 1)),
+                    ),
+                )
+                counters.update(statements=0, rows=0)
+                start = time.perf_counter()
+                for i in range(1, ROUNDS + 1):
+                    # cache pusty, żeby walidacja szła do bazy
+                    cache.developers.clear()
+                    shift = (i % 10) * members // 10
+                    update(
+                        db, project["id"], list(range(1 + shift, members + 1 + shift))
+                    )
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{members:>8} {name:>13} {elapsed * 1000 / ROUNDS:>10.1f} "
+                    f"{counters['statements'] / ROUNDS:>8.0f} "
+                    f"{counters['rows'] / ROUNDS:>6.0f}"
+                )
+            db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
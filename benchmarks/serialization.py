@@ -0,0 +1,85 @@
+"""Serializacja listy tasków do JSON: tak jak robi to FastAPI z
+`response_model` (obiekty modelu, walidacja każdego schematem i zapis przez
+Pydantic) i szybką ścieżką z `app.responses` (kolumny ze schematu prosto do
+orjson). Osobno sama serializacja gotowych danych i całość z odczytem z bazy.
+
+Obie ścieżki muszą dać te same bajty - skrypt to sprawdza. Dane z
+`benchmarks.synthetic`, baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.serialization
+"""
+import os
+import tempfile
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, responses, schemas
+from app.database import create_db_engine
+from benchmarks.synthetic import generate
+
+TASKS = 100_000
+ROUNDS = 3
+
+
+def best_ms(function):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        generate(engine, projects=1, tasks=TASKS, members_per_project=20)
+        db = sessionmaker(bind=engine)()
+        adapter = TypeAdapter(list[schemas.Task])
+
+        def load_models():
+            db.expunge_all()
+            return (
+                db.query(models.Task)
+                .filter(models.Task.project_id == 1)
+                .order_by(models.Task.id)
+                .all()
+            )
+
+        def response_model_path():
+            tasks = adapter.validate_python(load_models(), from_attributes=True)
+            return adapter.dump_json(tasks)
+
+        def fast_path():
+            return responses.dumps(crud.read_project_tasks(db, 1)[0])
+
+        assert response_model_path() == fast_path()
+
+        objects = load_models()
+        rows = crud.read_project_tasks(db, 1)[0]
+        results = [
+            (
+                "validate + dump_json",
+                best_ms(
+                    lambda: adapter.dump_json(
+                        adapter.validate_python(objects, from_attributes=True)
+                    )
+                ),
+            ),
+            ("orjson", best_ms(lambda: responses.dumps(rows))),
+            ("response_model, with db", best_ms(response_model_path)),
+            ("fast path, with db", best_ms(fast_path)),
+        ]
+        print(f"{'variant':>24} {'ms':>8} {'tasks/s':>10}")
+        for name, elapsed in results:
+            print(f"{name:>24} {elapsed:>8.0f} {TASKS / elapsed * 1000:>10.0f}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Przepustowość odczytów i zapisów SQLite z profilem "production" i bez niego.
+
+Kilka wątków naraz zapisuje taski (commit po każdym) i czyta taski projektu,
+tak jak robią to requesty i zadania przydziału. Baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.sqlite_profile
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import create_db_engine
+
+DURATION = 3.0
+TASKS_PER_PROJECT = 2000
+
+
+def worker(Session, write, deadline, counts, index):
+    db = Session()
+    done = errors = 0
+    while time.perf_counter() < deadline:
+        try:
+            if write:
+                db.add(
+                    models.Task(
+                        name="t",
+                        project_id=index % 4 + 1,
+                        estimation=3,
+                        specialization="BACKEND",
+                    )
+                )
+                db.commit()
+            else:
+                db.query(models.Task).filter(
+                    models.Task.project_id == index % 4 + 1
+                ).limit(100).all()
+            done += 1
+        except OperationalError:
+            db.rollback()
+            errors += 1
+    db.close()
+    counts.append((write, done, errors))
+
+
+def run(profile, readers, writers):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(
+            f"sqlite:///{os.path.join(directory, 'bench.db')}", profile
+        )
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(
+                models.Task.__table__.insert(),
+                [
+                    {
+                        "name": "t",
+                        "project_id": i % 4 + 1,
+                        "estimation": 3,
+                        "specialization": "BACKEND",
+                    }
+                    for i in range(TASKS_PER_PROJECT * 4)
+                ],
+            )
+        Session = sessionmaker(bind=engine)
+        counts = []
+        deadline = time.perf_counter() + DURATION
+        threads = [
+            threading.Thread(
+                target=worker, args=(Session, i < writers, deadline, counts, i)
+            )
+            for i in range(readers + writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+    reads = sum(done for write, done, _ in counts if not write)
+    writes = sum(done for write, done, _ in counts if write)
+    errors = sum(e for _, _, e in counts)
+    return reads / DURATION, writes / DURATION, errors
+
+
+def main():
+    print(
+        f"{'profile':>10} {'readers':>8} {'writers':>8} "
+        f"{'reads/s':>9} {'writes/s':>9} {'errors':>7}"
+    )
+    for readers, writers in [(4, 0), (0, 4), (4, 2), (8, 4)]:
+        for profile in ["default", "production"]:
+            reads, writes, errors = run(profile, readers, writers)
+            print(
+                f"{profile:>10} {readers:>8} {writers:>8} "
+                f"{reads:>9.0f} {writes:>9.0f} {errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Czas zimnego startu (od uruchomienia procesu do pierwszej odpowiedzi 200 z
+`GET /health/ready`) i przepustowość z jednym i z kilkoma workerami.
+
+Serwery są prawdziwymi procesami (`uvicorn app.main:app` jak do developmentu,
+z `--reload` jak wcześniej w obrazie dockera, i `python -m app.serve`) na bazie
+w katalogu tymczasowym. Przepustowość mierzą równocześni klienci httpx
+czytający taski i projekt; zysk z workerów zależy od liczby rdzeni.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.startup
+"""
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PORT = 8799
+URL = f"http://127.0.0.1:{PORT}"
+CLIENTS = 32
+DURATION_SECONDS = 5
+TASKS = 500
+START_TIMEOUT_SECONDS = 60
+
+
+def start(command, env):
+    process = subprocess.Popen(
+        [sys.executable, "-m", *command],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    begin = time.perf_counter()
+    while time.perf_counter() - begin < START_TIMEOUT_SECONDS:
+        try:
+            if httpx.get(f"{URL}/health/ready").status_code == 200:
+                return process, (time.perf_counter() - begin) * 1000
+        except httpx.TransportError:
+            pass
+        time.sleep(0.02)
+    stop(process)
+    raise RuntimeError(f"{' '.join(command)} did not become ready")
+
+
+def stop(process):
+    process.terminate()
+    process.wait()
+
+
+def seed():
+    httpx.post(
+        f"{URL}/developer",
+        json={"first_name": "a", "last_name": "b", "specialization": "BACKEND"},
+    )
+    httpx.post(
+        f"{URL}/project", json={"name": "p", "developer_owner_id": 1, "developers": [1]}
+    )
+    httpx.post(
+        f"{URL}/project/1/tasks:bulk",
+        json=[
+            {"name": "t", "estimation": 3, "specialization": "BACKEND"}
+            for _ in range(TASKS)
+        ],
+    )
+
+
+async def client(http, deadline, latencies):
+    paths = ["/project/1/tasks?limit=100", "/project/1"]
+    i = 0
+    while time.perf_counter() < deadline:
+        start_time = time.perf_counter()
+        response = await http.get(paths[i % len(paths)])
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start_time)
+        i += 1
+
+
+async def load():
+    latencies = []
+    limits = httpx.Limits(max_connections=CLIENTS)
+    async with httpx.AsyncClient(base_url=URL, limits=limits) as http:
+        deadline = time.perf_counter() + DURATION_SECONDS
+        await asyncio.gather(
+            *(client(http, deadline, latencies) for _ in range(CLIENTS))
+        )
+    latencies.sort()
+    return (
+        len(latencies) / DURATION_SECONDS,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.95)] * 1000,
+    )
+
+
+def main():
+    workers = max(2, os.cpu_count() or 1)
+    serve = ["app.serve", "--port", str(PORT), "--no-access-log"]
+    uvicorn = ["uvicorn", "app.main:app", "--port", str(PORT), "--no-access-log"]
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}",
+            LOG_LEVEL="WARNING",
+        )
+        print(f"cold start (CPU: {os.cpu_count()})")
+        print(f"{'command':>40} {'database':>9} {'ms':>7}")
+        variants = [
+            ("uvicorn app.main:app --reload", uvicorn + ["--reload"], True),
+            ("uvicorn app.main:app", uvicorn, True),
+            ("app.serve --workers 1", serve + ["--workers", "1"], True),
+            ("app.serve --workers 1", serve + ["--workers", "1"], False),
+            (
+                f"app.serve --workers {workers}",
+                serve + ["--workers", str(workers)],
+                False,
+            ),
+        ]
+        for name, command, empty in variants:
+            if empty:
+                for suffix in ("", "-wal", "-shm"):
+                    path = os.path.join(directory, "bench.db" + suffix)
+                    if os.path.exists(path):
+                        os.remove(path)
+            process, elapsed = start(command, env)
+            stop(process)
+            print(f"{name:>40} {'empty' if empty else 'migrated':>9} {elapsed:>7.0f}")
+
+        print(f"\nthroughput ({CLIENTS} clients, {DURATION_SECONDS} s)")
+        print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        seeded = False
+        for count in [1, workers]:
+            process, _ = start(serve + ["--workers", str(count)], env)
+            try:
+                if not seeded:
+                    seed()
+                    seeded = True
+                # wszystkie workery muszą zdążyć wystartować
+                time.sleep(1)
+                rate, p50, p95 = asyncio.run(load())
+            finally:
+                stop(process)
+            print(f"{count:>8} {rate:>8.0f} {p50:>8.1f} {p95:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Zestaw scenariuszy na danych z `benchmarks.synthetic`: trasy FastAPI
+wywoływane w procesie (TestClient) i funkcje `crud` na zwykłej sesji.
+
+Dla każdego scenariusza podaje operacje na sekundę, opóźnienia p50/p95/p99
+i liczbę zapytań do bazy na operację. Wynik idzie w JSON na stdout (albo do
+pliku z `--output`), razem z commitem i rozmiarami danych; `--compare` zestawia
+go z wcześniejszym plikiem. Baza w pliku tymczasowym (DATABASE_URL ustawiany
+przed importem aplikacji).
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.suite --output wyniki.json
+    python -m benchmarks.suite --scenario http_read_project --compare wyniki.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+directory = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+from app import crud, models  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.synthetic import ESTIMATIONS, SPECIALIZATIONS, generate  # noqa: E402
+
+SCENARIOS = {}
+
+
+def scenario(name, iterations=200):
+    """Rejestruje scenariusz; `iterations` to domyślna liczba powtórzeń
+    (mnożona przez --scale)."""
+
+    def register(function):
+        SCENARIOS[name] = (function, iterations)
+        return function
+
+    return register
+
+
+def new_task(rng):
+    return {
+        "name": "bench",
+        "estimation": rng.choice(ESTIMATIONS),
+        "specialization": rng.choice(SPECIALIZATIONS),
+    }
+
+
+def check(response):
+    # odpowiedź z błędem jest zwykle dużo szybsza, więc zafałszowałaby wynik
+    assert response.status_code < 300, (
+        f"{response.request.method} {response.request.url}: "
+        f"{response.status_code} {response.text[:200]}"
+    )
+
+
+@scenario("http_read_project", 500)
+def http_read_project(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    check(context["client"].get(f"/project/{project_id}"))
+
+
+@scenario("http_list_projects", 300)
+def http_list_projects(context):
+    skip = context["rng"].randint(0, 10)
+    check(context["client"].get(f"/projects?limit=20&skip={skip}"))
+
+
+@scenario("http_list_tasks_page", 300)
+def http_list_tasks_page(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    check(context["client"].get(f"/project/{project_id}/tasks?limit=100"))
+
+
+@scenario("http_create_task", 300)
+def http_create_task(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    check(
+        context["client"].post(
+            f"/project/{project_id}/task", json=new_task(context["rng"])
+        )
+    )
+
+
+@scenario("http_update_task", 300)
+def http_update_task(context):
+    project_id, task_id = context["rng"].choice(context["open_tasks"])
+    check(
+        context["client"].put(
+            f"/project/{project_id}/task/{task_id}", json={"name": "renamed"}
+        )
+    )
+
+
+@scenario("http_create_assignment", 20)
+def http_create_assignment(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    check(context["client"].post(f"/project/{project_id}/assignment"))
+
+
+@scenario("crud_read_project_tasks", 50)
+def crud_read_project_tasks(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    crud.read_project_tasks(context["db"], project_id, None, None)
+
+
+@scenario("crud_bulk_create_tasks", 10)
+def crud_bulk_create_tasks(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    items = [new_task(context["rng"]) for _ in range(1000)]
+    crud.bulk_create_tasks(context["db"], project_id, items)
+
+
+@scenario("crud_create_assignment_greedy", 20)
+def crud_create_assignment_greedy(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    crud.create_assignment(context["db"], project_id, "greedy")
+
+
+@scenario("crud_create_assignment_optimal", 10)
+def crud_create_assignment_optimal(context):
+    project_id = context["rng"].randint(1, context["projects"])
+    crud.create_assignment(context["db"], project_id, "optimal")
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[
+        min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    ]
+
+
+def run_scenario(function, iterations, context, statements):
+    latencies = []
+    # kilka przebiegów na rozgrzanie (cache, plany zapytań)
+    for _ in range(min(5, iterations)):
+        function(context)
+    statements.clear()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation_start = time.perf_counter()
+        function(context)
+        latencies.append(time.perf_counter() - operation_start)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_s": round(iterations / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "queries_per_op": round(len(statements) / iterations, 2),
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Tabela zmian względem wcześniejszego wyniku (stosunek ops/s i p95)."""
+    lines = [
+        f"{'scenario':>32} {'ops/s':>9} {'base':>9} {'ratio':>6} "
+        f"{'p95 ms':>8} {'base':>8}"
+    ]
+    for name, result in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        lines.append(
+            f"{name:>32} {result['ops_per_s']:>9.1f} {base['ops_per_s']:>9.1f} "
+            f"{result['ops_per_s'] / base['ops_per_s']:>6.2f} "
+            f"{result['p95_ms']:>8.2f} {base['p95_ms']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    parser.add_argument("--developers", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="mnożnik liczby powtórzeń"
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), default=None
+    )
+    parser.add_argument("--output", help="plik na wynik w JSON")
+    parser.add_argument("--compare", help="wcześniejszy wynik do porównania")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    dataset = generate(
+        engine,
+        developers=args.developers,
+        projects=args.projects,
+        tasks=args.tasks,
+        seed=args.seed,
+    )
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+    results = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "dataset": dataset,
+        "scenarios": {},
+    }
+    with TestClient(app) as client:
+        db = SessionLocal()
+        context = {
+            "client": client,
+            "db": db,
+            "projects": args.projects,
+            "open_tasks": db.execute(
+                select(models.Task.project_id, models.Task.id).where(
+                    models.Task.state == "IN_PROGRESS"
+                )
+            ).all(),
+        }
+        for name in args.scenario or SCENARIOS:
+            function, iterations = SCENARIOS[name]
+            # każdy scenariusz ma własny generator, więc wynik nie zależy od
+            # tego, które scenariusze uruchomiono wcześniej
+            context["rng"] = random.Random(f"{args.seed}-{name}")
+            results["scenarios"][name] = run_scenario(
+                function,
+                max(1, int(iterations * args.scale)),
+                context,
+                statements,
+            )
+            print(f"{name}: {results['scenarios'][name]}", file=sys.stderr)
+        db.close()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as file:
+            print(compare(results, json.load(file)), file=sys.stderr)
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
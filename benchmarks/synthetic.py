@@ -0,0 +1,112 @@
+"""Powtarzalny generator danych: developerzy wszystkich specjalizacji, projekty
+z członkami i taski z historią (CLOSED z datami przypisania i zakończenia).
+
+Ten sam `seed` i te same rozmiary dają te same wiersze z tymi samymi id, o ile
+baza jest pusta. Agregaty statystyk (`app.analytics`) są na końcu przeliczane
+z wstawionych tasków. Czas wykonania taska zależy od estymacji i od stałego dla
+developera tempa, więc statystyki ukończeń wyglądają jak prawdziwe.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import analytics, models, schemas
+
+# tylko wartości, które przechodzą walidator TaskCreate (2 jest odrzucane,
+# a 1 zapisuje się jako True)
+ESTIMATIONS = [3, 5, 8, 13, 21]
+# małe taski są częstsze niż duże
+ESTIMATION_WEIGHTS = [18, 16, 10, 5, 2]
+SPECIALIZATIONS = [specialization.value for specialization in schemas.Specialization]
+HISTORY_START = datetime(2023, 1, 1)
+
+
+def generate(
+    bind,
+    developers=200,
+    projects=20,
+    tasks=20_000,
+    members_per_project=20,
+    closed_ratio=0.6,
+    in_progress_ratio=0.1,
+    seed=0,
+):
+    """Wypełnia pustą bazę pod `bind`. Zwraca opis zbioru (rozmiary i `seed`)."""
+    rng = random.Random(seed)
+    developer_rows = [
+        {
+            "first_name": f"dev{i}",
+            "last_name": "synthetic",
+            # po kolei, więc każda specjalizacja ma tylu samo developerów (±1)
+            "specialization": SPECIALIZATIONS[i % len(SPECIALIZATIONS)],
+        }
+        for i in range(developers)
+    ]
+    # godziny na punkt estymacji
+    speed = [rng.uniform(0.5, 2.0) for _ in range(developers)]
+    members_per_project = min(members_per_project, developers)
+    members = [
+        sorted(rng.sample(range(1, developers + 1), members_per_project))
+        for _ in range(projects)
+    ]
+    project_rows = [
+        {"name": f"project{i}", "developer_owner_id": members[i][0]}
+        for i in range(projects)
+    ]
+    membership_rows = [
+        {"project_id": project_id, "developer_id": developer_id}
+        for project_id, project_members in enumerate(members, start=1)
+        for developer_id in project_members
+    ]
+
+    task_rows = []
+    for i in range(tasks):
+        project_id = rng.randint(1, projects)
+        specialization = rng.choice(SPECIALIZATIONS)
+        estimation = rng.choices(ESTIMATIONS, ESTIMATION_WEIGHTS)[0]
+        row = {
+            "name": f"task{i}",
+            "project_id": project_id,
+            "estimation": estimation,
+            "specialization": specialization,
+            "created_at": HISTORY_START,
+            "state": "NOT_ASSIGNED",
+            "developer_id": None,
+            "datetime_assigned": None,
+            "datetime_completed": None,
+        }
+        roll = rng.random()
+        if roll < closed_ratio + in_progress_ratio:
+            project_members = members[project_id - 1]
+            matching = [
+                d
+                for d in project_members
+                if developer_rows[d - 1]["specialization"] == specialization
+            ]
+            developer_id = rng.choice(matching or project_members)
+            assigned = HISTORY_START + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+            row["developer_id"] = developer_id
+            row["datetime_assigned"] = assigned
+            row["state"] = "IN_PROGRESS"
+            if roll < closed_ratio:
+                hours = estimation * speed[developer_id - 1] * rng.uniform(0.7, 1.3)
+                row["state"] = "CLOSED"
+                row["datetime_completed"] = assigned + timedelta(hours=hours)
+        task_rows.append(row)
+
+    with bind.begin() as connection:
+        connection.execute(insert(models.Developer.__table__), developer_rows)
+        connection.execute(insert(models.Project.__table__), project_rows)
+        connection.execute(insert(models.ProjectDeveloper.__table__), membership_rows)
+        connection.execute(insert(models.Task.__table__), task_rows)
+        analytics.rebuild(connection)
+    return {
+        "seed": seed,
+        "developers": developers,
+        "projects": projects,
+        "members_per_project": members_per_project,
+        "tasks": tasks,
+        "closed_ratio": closed_ratio,
+        "in_progress_ratio": in_progress_ratio,
+    }
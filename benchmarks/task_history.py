@@ -0,0 +1,65 @@
+"""Przydział dla projektu z bardzo długą historią (domyślnie milion zamkniętych
+tasków): czas `create_assignment` i szczyt pamięci zaalokowanej w Pythonie
+(tracemalloc) w trakcie liczenia.
+
+Większość pracy to wczytanie historii i policzenie średnich czasów developerów
+(`crud.read_completion_stats`); tasków do przydzielenia jest niewiele. Baza
+w pliku tymczasowym, generowanie danych trwa kilkadziesiąt sekund.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.task_history
+    python -m benchmarks.task_history --tasks 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.database import create_db_engine
+from benchmarks.synthetic import generate
+
+ROUNDS = 3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task history benchmark")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        generate(
+            engine,
+            developers=100,
+            projects=1,
+            tasks=args.tasks,
+            members_per_project=100,
+            closed_ratio=0.999,
+            in_progress_ratio=0.0,
+        )
+        db = sessionmaker(bind=engine)()
+        history = db.query(models.Task).filter_by(state="CLOSED").count()
+        crud.create_assignment(db, 1)
+        timings = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            crud.create_assignment(db, 1)
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        crud.create_assignment(db, 1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"history={history} best_ms={min(timings) * 1000:.0f} "
+            f"peak_mib={peak / 2**20:.1f}"
+        )
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
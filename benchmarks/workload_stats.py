@@ -0,0 +1,62 @@
+"""Statystyki projektu i developera (`GET /project/{id}/stats`,
+`GET /developer/{id}/stats`) z tabel agregatów przy rosnącej historii, obok
+statystyk ukończeń liczonych na bieżąco z tabeli task
+(`crud.read_completion_stats`) i czasu przebudowy agregatów od zera.
+
+Odczyt z agregatów powinien mieć stały czas, niezależnie od liczby tasków.
+Dane z `benchmarks.synthetic`, baza w pliku tymczasowym.
+
+Uruchomienie z katalogu głównego repo:
+    python -m benchmarks.workload_stats
+"""
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app import analytics, crud, models
+from app.database import create_db_engine
+from benchmarks.synthetic import generate
+
+ROUNDS = 50
+
+
+def timed(function, rounds=ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        print(
+            f"{'tasks':>8} {'project ms':>11} {'developer ms':>13} "
+            f"{'on the fly ms':>14} {'rebuild ms':>11}"
+        )
+        for tasks in [10_000, 100_000, 500_000]:
+            models.Base.metadata.drop_all(bind=engine)
+            models.Base.metadata.create_all(bind=engine)
+            generate(
+                engine, developers=50, projects=5, tasks=tasks, members_per_project=20
+            )
+            db = sessionmaker(bind=engine)()
+            project = timed(lambda: crud.read_project_stats(db, 1, 52))
+            developer = timed(lambda: crud.read_developer_stats(db, 1, 52))
+            on_the_fly = timed(lambda: crud.read_completion_stats(db, [1]), 5)
+            with engine.begin() as connection:
+                start = time.perf_counter()
+                analytics.rebuild(connection)
+                rebuild = (time.perf_counter() - start) * 1000
+            print(
+                f"{tasks:>8} {project:>11.2f} {developer:>13.2f} "
+                f"{on_the_fly:>14.1f} {rebuild:>11.0f}"
+            )
+            db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
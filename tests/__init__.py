@@ -0,0 +1 @@
+"""Testy regresji (liczba zapytań, plany zapytań, migracje): `python -m pytest`."""
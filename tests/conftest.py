@@ -0,0 +1,43 @@
+import os
+
+# baza w pamięci - DATABASE_URL musi być ustawiony przed pierwszym importem app
+os.environ["DATABASE_URL"] = "sqlite://"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import cache, models  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    # każdy test zaczyna od pustej bazy i pustego cache; schemat tworzy
+    # migracja przy starcie aplikacji
+    models.Base.metadata.drop_all(bind=engine)
+    cache.developers.clear()
+    cache.project_developers.clear()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def statements():
+    """Zapytania SQL wysłane do bazy od początku testu."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+from app import cache, models, schemas
+from app.assignment import batch
+from app.assignment.batch import AssignmentTask
+
+TASK = {"name": "t", "estimation": 3, "specialization": "BACKEND"}
+
+
+def test_batch_skips_memberships_of_missing_developers(client, db):
+    client.post(
+        "/developer",
+        json={"first_name": "a", "last_name": "b", "specialization": "BACKEND"},
+    ).raise_for_status()
+    client.post(
+        "/project", json={"name": "p", "developer_owner_id": 1, "developers": [1]}
+    ).raise_for_status()
+    client.post("/project/1/task", json=TASK).raise_for_status()
+    # wiersz po developerze usuniętym z pominięciem API
+    db.add(models.ProjectDeveloper(project_id=1, developer_id=99))
+    db.commit()
+    cache.project_developers.clear()
+
+    single = client.post("/project/1/assignment")
+    batch = client.post("/assignments:batch", json={"project_ids": [1]})
+
+    assert single.status_code == 200
+    assert batch.status_code == 200
+    assert batch.json()["assignments"][0]["changes"] == {"1": [1]}
+
+
+def test_batch_groups_planned_in_process_pool_match_in_process(monkeypatch):
+    developers = [
+        schemas.Developer(id=i, first_name="a", last_name="b", specialization="BACKEND")
+        for i in (1, 2, 3)
+    ]
+    tasks = [AssignmentTask(i, 3, "BACKEND") for i in range(1, 7)]
+    # projekty 1 i 2 dzielą developera 1, projekt 3 jest osobną grupą
+    projects = [
+        (1, tasks[:2], developers[:1], {}),
+        (2, tasks[2:4], developers[:2], {}),
+        (3, tasks[4:], developers[2:], {}),
+    ]
+    project_developer_ids = {1: [1], 2: [1, 2], 3: [3]}
+    monkeypatch.setattr(batch, "BATCH_WORKERS", 1)
+    expected = batch.plan_batch("greedy", None, projects, project_developer_ids)
+
+    monkeypatch.setattr(batch, "BATCH_WORKERS", 2)
+    monkeypatch.setattr(batch, "executor", None)
+    try:
+        planned = batch.plan_batch("greedy", None, projects, project_developer_ids)
+        assert batch.executor._mp_context.get_start_method() == "spawn"
+    finally:
+        batch.executor.shutdown()
+    assert planned == expected
+
+
+def create_shared_developer_projects(client, db):
+    for name in ("a", "b", "c"):
+        client.post(
+            "/developer",
+            json={"first_name": name, "last_name": "b", "specialization": "BACKEND"},
+        ).raise_for_status()
+    for developers in ([1, 2], [1, 3]):
+        client.post(
+            "/project",
+            json={"name": "p", "developer_owner_id": 1, "developers": developers},
+        ).raise_for_status()
+    # historia: developer 1 jest najszybszy, więc greedy dałby mu wszystko
+    assigned = datetime(2024, 1, 1)
+    for developer_id, hours in ((1, 1), (2, 5), (3, 5)):
+        db.add(
+            models.Task(
+                name="done",
+                project_id=1 if developer_id != 3 else 2,
+                state="CLOSED",
+                estimation=3,
+                specialization="BACKEND",
+                developer_id=developer_id,
+                datetime_assigned=assigned,
+                datetime_completed=assigned + timedelta(hours=hours),
+            )
+        )
+        db.add(
+            models.Task(
+                name="done",
+                project_id=2 if developer_id != 3 else 1,
+                state="CLOSED",
+                estimation=3,
+                specialization="BACKEND",
+                developer_id=developer_id,
+                datetime_assigned=assigned,
+                datetime_completed=assigned + timedelta(hours=hours),
+            )
+        )
+    db.commit()
+    for project_id in (1, 2):
+        client.post(
+            f"/project/{project_id}/tasks:bulk", json=[TASK] * 4
+        ).raise_for_status()
+
+
+def shared_developer_tasks(response):
+    assert response.status_code == 200
+    return sum(
+        len(assignment["changes"].get("1", []))
+        for assignment in response.json()["assignments"]
+    )
+
+
+def test_batch_does_not_overbook_shared_developer(client, db):
+    create_shared_developer_projects(client, db)
+
+    response = client.post("/assignments:batch", json={})
+
+    # 8 tasków dla 3 developerów - wspólny nie dostaje połowy wszystkiego
+    assert shared_developer_tasks(response) <= 3
+
+
+def test_batch_greedy_respects_capacity_across_projects(client, db):
+    create_shared_developer_projects(client, db)
+
+    response = client.post("/assignments:batch?strategy=greedy&capacity=2", json={})
+
+    assert shared_developer_tasks(response) == 2
+    assignments = response.json()["assignments"]
+    assert all(
+        len(tasks) <= 2
+        for assignment in assignments
+        for tasks in assignment["changes"].values()
+    )
@@ -0,0 +1,40 @@
+import json
+
+from app import crud
+
+
+def test_bulk_ids_follow_input_lines(client, monkeypatch):
+    client.post(
+        "/developer",
+        json={"first_name": "a", "last_name": "b", "specialization": "BACKEND"},
+    ).raise_for_status()
+    client.post(
+        "/project", json={"name": "p", "developer_owner_id": 1, "developers": [1]}
+    ).raise_for_status()
+    # kilka kawałków, żeby id szły też przez granice transakcji
+    monkeypatch.setattr(crud, "BULK_TASK_CHUNK_SIZE", 4)
+    items = []
+    for i in range(10):
+        item = {"name": f"line{i}", "estimation": 3, "specialization": "BACKEND"}
+        if i % 3 == 0:
+            item["developer_id"] = 1
+        items.append(item)
+    items[5]["estimation"] = 4
+
+    response = client.post(
+        "/project/1/tasks:bulk",
+        content="\n".join(json.dumps(item) for item in items),
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == list(range(10))
+    assert results[5]["id"] is None
+    ids = [result["id"] for result in results if result["id"] is not None]
+    assert ids == sorted(ids)
+    for index, result in enumerate(results):
+        if result["id"] is None:
+            continue
+        task = client.get(f"/project/1/task/{result['id']}").json()
+        assert task["name"] == f"line{index}"
+        assert task["developer_id"] == items[index].get("developer_id")
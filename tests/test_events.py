@@ -0,0 +1,52 @@
+TASK = {"name": "t", "estimation": 3, "specialization": "BACKEND"}
+
+
+def events(client):
+    response = client.get("/events")
+    response.raise_for_status()
+    return response.json()
+
+
+def create_project(client):
+    client.post(
+        "/developer",
+        json={"first_name": "a", "last_name": "b", "specialization": "BACKEND"},
+    ).raise_for_status()
+    client.post(
+        "/project", json={"name": "p", "developer_owner_id": 1, "developers": [1]}
+    ).raise_for_status()
+
+
+def test_task_event_has_stored_estimation(client):
+    create_project(client)
+
+    task = client.post("/project/1/task", json={**TASK, "estimation": 0}).json()
+
+    event = events(client)[-1]
+    assert event["type"] == "task.created"
+    # True == 1 w Pythonie - porównanie samo nie wystarczy
+    assert type(event["data"]["task"]["estimation"]) is int
+    assert event["data"]["task"]["estimation"] == task["estimation"] == 1
+
+
+def test_bulk_import_records_event_with_task_ids(client):
+    create_project(client)
+
+    response = client.post("/project/1/tasks:bulk", json=[TASK, {"name": "x"}, TASK])
+
+    ids = [item["id"] for item in response.json()["results"] if item["id"] is not None]
+    created = [event for event in events(client) if event["type"] == "tasks.created"]
+    assert len(created) == 1
+    assert created[0]["data"] == {"task_ids": ids}
+    assert len(ids) == 2
+
+
+def test_project_delete_records_developers_change(client):
+    create_project(client)
+
+    client.delete("/project/1").raise_for_status()
+
+    event = events(client)[-1]
+    assert event["type"] == "project.developers_changed"
+    assert event["project_id"] == 1
+    assert event["data"] == {"added": [], "removed": [1]}
@@ -0,0 +1,167 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app import cache, crud
+from app.database import create_db_engine
+from app.migrations import check_schema, migrate
+
+# schemat z pierwszej wersji models.py - taki mają istniejące pliki database/app.db
+BASELINE_SCHEMA = """
+CREATE TABLE developer (
+    id INTEGER NOT NULL,
+    first_name VARCHAR NOT NULL,
+    last_name VARCHAR NOT NULL,
+    specialization VARCHAR NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_developer_id ON developer (id);
+CREATE TABLE project (
+    id INTEGER NOT NULL,
+    developer_owner_id INTEGER NOT NULL,
+    name VARCHAR NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(developer_owner_id) REFERENCES developer (id)
+);
+CREATE INDEX ix_project_id ON project (id);
+CREATE TABLE task (
+    id INTEGER NOT NULL,
+    name VARCHAR NOT NULL,
+    project_id INTEGER NOT NULL,
+    state VARCHAR NOT NULL,
+    created_at DATETIME NOT NULL,
+    estimation INTEGER NOT NULL,
+    specialization VARCHAR NOT NULL,
+    developer_id INTEGER,
+    datetime_assigned DATETIME,
+    datetime_completed DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(project_id) REFERENCES project (id),
+    FOREIGN KEY(developer_id) REFERENCES developer (id)
+);
+CREATE INDEX ix_task_id ON task (id);
+CREATE TABLE project_developer (
+    id INTEGER NOT NULL,
+    developer_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(developer_id) REFERENCES developer (id),
+    FOREIGN KEY(project_id) REFERENCES project (id)
+);
+CREATE INDEX ix_project_developer_developer_id ON project_developer (developer_id);
+CREATE INDEX ix_project_developer_id ON project_developer (id);
+CREATE TABLE assignment (
+    id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    accepted BOOLEAN,
+    PRIMARY KEY (id),
+    FOREIGN KEY(project_id) REFERENCES project (id)
+);
+CREATE INDEX ix_assignment_id ON assignment (id);
+CREATE TABLE proposed_change (
+    id INTEGER NOT NULL,
+    assignment_id INTEGER NOT NULL,
+    developer_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(assignment_id) REFERENCES assignment (id),
+    FOREIGN KEY(developer_id) REFERENCES developer (id)
+);
+CREATE INDEX ix_proposed_change_id ON proposed_change (id);
+CREATE INDEX ix_proposed_change_developer_id ON proposed_change (developer_id);
+"""
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    # cache procesu może mieć projekty z bazy innego testu
+    cache.developers.clear()
+    cache.project_developers.clear()
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA.split(";"):
+            if statement.strip():
+                connection.execute(text(statement))
+        connection.execute(
+            text(
+                "INSERT INTO developer VALUES "
+                "(1, 'a', 'b', 'BACKEND'), (2, 'c', 'd', 'FRONTEND')"
+            )
+        )
+        connection.execute(text("INSERT INTO project VALUES (1, 1, 'p')"))
+        # stara wersja update_project potrafiła dopisać developera drugi raz
+        connection.execute(
+            text("INSERT INTO project_developer VALUES (1, 1, 1), (2, 2, 1), (3, 1, 1)")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO task VALUES "
+                "(1, 't1', 1, 'CLOSED', :created, 3, 'BACKEND', 1, :assigned, :done), "
+                "(2, 't2', 1, 'IN_PROGRESS', :created, 5, 'FRONTEND', 2, :assigned, "
+                "NULL), "
+                "(3, 't3', 1, 'NOT_ASSIGNED', :created, 8, 'BACKEND', NULL, NULL, NULL)"
+            ),
+            {
+                "created": datetime(2024, 1, 1),
+                "assigned": datetime(2024, 1, 2),
+                "done": datetime(2024, 1, 2, 5),
+            },
+        )
+        connection.execute(text("INSERT INTO assignment VALUES (1, 1, NULL)"))
+        connection.execute(text("INSERT INTO proposed_change VALUES (1, 1, 1, 3)"))
+    yield engine
+    engine.dispose()
+
+
+def test_migrate_upgrades_baseline_database(baseline_engine):
+    assert check_schema(baseline_engine)
+
+    migrate(baseline_engine)
+
+    assert check_schema(baseline_engine) == []
+    inspector = inspect(baseline_engine)
+    unique = {
+        index["name"]
+        for index in inspector.get_indexes("project_developer")
+        if index["unique"]
+    }
+    assert "ix_project_developer_project_id_developer_id" in unique
+    with baseline_engine.connect() as connection:
+        # zdublowane przypisanie usunięte, pierwsze zostaje
+        assert connection.execute(
+            text("SELECT id FROM project_developer ORDER BY id")
+        ).scalars().all() == [1, 2]
+        assert connection.execute(text("SELECT version FROM project")).scalar() == 1
+        assert connection.execute(text("SELECT count(*) FROM task")).scalar() == 3
+        # agregaty wypełnione z istniejących tasków
+        assert connection.execute(
+            text("SELECT task_count, seconds_sum FROM cycle_time_stats")
+        ).one() == (1, 5 * 3600)
+
+    db = sessionmaker(bind=baseline_engine)()
+    try:
+        assert crud.read_project(db, 1)["developers"] == [1, 2]
+        stats = crud.read_project_stats(db, 1, 12)
+        assert stats["in_progress"] == {"tasks": 1, "estimation": 5}
+    finally:
+        db.close()
+
+
+def test_migrate_is_idempotent(baseline_engine):
+    migrate(baseline_engine)
+    migrate(baseline_engine)
+
+    assert check_schema(baseline_engine) == []
+    with baseline_engine.connect() as connection:
+        assert (
+            connection.execute(text("SELECT count(*) FROM project_developer")).scalar()
+            == 2
+        )
+        assert (
+            connection.execute(
+                text("SELECT sum(task_count) FROM open_task_stats")
+            ).scalar()
+            == 2
+        )
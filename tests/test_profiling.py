@@ -0,0 +1,28 @@
+from app import metrics
+
+
+def test_profile_covers_threadpool_endpoint(client, monkeypatch):
+    monkeypatch.setattr(metrics, "PROFILING_ENABLED", True)
+    client.post(
+        "/developer",
+        json={"first_name": "a", "last_name": "b", "specialization": "BACKEND"},
+    ).raise_for_status()
+    client.post(
+        "/project", json={"name": "p", "developer_owner_id": 1, "developers": [1]}
+    ).raise_for_status()
+
+    response = client.get("/projects?profile=1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    # endpoint `def` działa na puli wątków - jego praca też ma być w profilu
+    assert "crud.py" in response.text
+    assert "(read_projects)" in response.text
+    assert "sqlalchemy" in response.text
+
+
+def test_profile_disabled_returns_response(client):
+    response = client.get("/projects?profile=1")
+
+    assert response.status_code == 200
+    assert response.json() == []
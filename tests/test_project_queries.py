@@ -0,0 +1,49 @@
+from app import cache, crud, schemas
+
+PROJECTS = 150
+DEVELOPERS = 5
+
+
+def create_projects(db):
+    for i in range(DEVELOPERS):
+        crud.create_developer(
+            db,
+            schemas.DeveloperCreate(
+                first_name="dev", last_name=str(i), specialization="BACKEND"
+            ),
+        )
+    for i in range(PROJECTS):
+        crud.create_project(
+            db,
+            schemas.ProjectCreate(
+                name=f"project{i}",
+                developer_owner_id=1,
+                developers=[i % DEVELOPERS + 1, (i + 1) % DEVELOPERS + 1],
+            ),
+        )
+    # bez cache - liczy się najgorszy przypadek, skład każdego projektu z bazy
+    cache.project_developers.clear()
+
+
+def test_projects_listing_runs_fixed_number_of_statements(client, db, statements):
+    create_projects(db)
+    statements.clear()
+
+    response = client.get("/projects?limit=1000")
+
+    assert response.status_code == 200
+    projects = response.json()
+    assert len(projects) == PROJECTS
+    assert projects[7]["developers"] == [3, 4]
+    assert len(statements) <= 3, statements
+
+
+def test_developer_projects_run_fixed_number_of_statements(client, db, statements):
+    create_projects(db)
+    statements.clear()
+
+    response = client.get("/project/developer/1")
+
+    assert response.status_code == 200
+    assert len(response.json()) == PROJECTS
+    assert len(statements) <= 3, statements
@@ -0,0 +1,61 @@
+from app import crud, models
+
+TASK = {"name": "t", "estimation": 3, "specialization": "BACKEND"}
+
+
+def create_project(client, developers):
+    response = client.post(
+        "/project",
+        json={"name": "p", "developer_owner_id": 1, "developers": developers},
+    )
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def etag(client, project_id):
+    response = client.get(f"/project/{project_id}")
+    response.raise_for_status()
+    return response.headers["ETag"]
+
+
+def test_task_move_changes_both_etags(client):
+    client.post(
+        "/developer",
+        json={"first_name": "a", "last_name": "b", "specialization": "BACKEND"},
+    ).raise_for_status()
+    source = create_project(client, [1])
+    target = create_project(client, [1])
+    task_id = client.post(f"/project/{source}/task", json=TASK).json()["id"]
+    before = etag(client, source), etag(client, target)
+
+    client.put(
+        f"/project/{source}/task/{task_id}", json={"project_id": target}
+    ).raise_for_status()
+
+    after = etag(client, source), etag(client, target)
+    assert before[0] != after[0]
+    assert before[1] != after[1]
+    response = client.get(f"/project/{target}", headers={"If-None-Match": before[1]})
+    assert response.status_code == 200
+
+
+def test_developers_match_etag_after_change_in_another_process(client, db):
+    for name in ("a", "b"):
+        client.post(
+            "/developer",
+            json={"first_name": name, "last_name": "b", "specialization": "BACKEND"},
+        ).raise_for_status()
+    project_id = create_project(client, [1])
+    old_etag = etag(client, project_id)
+
+    # inny worker zmienia skład - cache tego procesu nie jest unieważniany
+    db.add(models.ProjectDeveloper(project_id=project_id, developer_id=2))
+    crud.bump_project_version(db, project_id)
+    db.commit()
+
+    response = client.get(f"/project/{project_id}", headers={"If-None-Match": old_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != old_etag
+    assert response.json()["developers"] == [1, 2]
+    response = client.get("/projects")
+    assert response.json()[0]["developers"] == [1, 2]
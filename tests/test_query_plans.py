@@ -0,0 +1,123 @@
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app import cache
+from app.database import engine
+
+
+@pytest.fixture
+def captured(client):
+    """Zapytania czytające i zmieniające wiersze (z parametrami) wysłane od
+    początku testu - bez INSERT-ów, które nie szukają wierszy."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.split()[0].upper() in ("SELECT", "UPDATE", "DELETE", "WITH"):
+            executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def run_workload(client):
+    # ścieżki wszystkich tras crud: odczyty, przydziały (też przyrostowe
+    # i wsadowe), akceptacja, statystyki, zdarzenia, przeniesienie taska i usuwanie
+    for i, specialization in enumerate(["BACKEND", "FRONTEND", "BACKEND"]):
+        client.post(
+            "/developer",
+            json={
+                "first_name": "a",
+                "last_name": str(i),
+                "specialization": specialization,
+            },
+        )
+    client.post(
+        "/project", json={"name": "p", "developer_owner_id": 1, "developers": [1, 2, 3]}
+    )
+    client.post(
+        "/project", json={"name": "q", "developer_owner_id": 2, "developers": [1]}
+    )
+    client.post(
+        "/project/1/tasks:bulk",
+        json=[
+            {
+                "name": f"t{i}",
+                "estimation": 3,
+                "specialization": ["BACKEND", "FRONTEND"][i % 2],
+            }
+            for i in range(10)
+        ],
+    )
+    client.post(
+        "/project/1/task",
+        json={"name": "x", "estimation": 5, "specialization": "BACKEND"},
+    )
+    # odczyty przez bazę, a nie z cache
+    cache.developers.clear()
+    cache.project_developers.clear()
+    for path in [
+        "/projects",
+        "/project/1",
+        "/project/developer/1",
+        "/developers",
+        "/developers?ids=1,2",
+        "/developer/1",
+        "/project/1/tasks",
+        "/project/1/tasks?limit=3",
+        "/project/1/tasks?ids=1,2",
+        "/project/1/task/1",
+    ]:
+        assert client.get(path).status_code == 200, path
+    assignment = client.post("/project/1/assignment").json()
+    client.post("/project/1/assignment?incremental=true")
+    for path in [
+        f"/project/1/assignment/{assignment['id']}",
+        f"/project/1/assignment/{assignment['id']}?expand=developers,tasks",
+        "/project/1/assignments",
+    ]:
+        assert client.get(path).status_code == 200, path
+    client.put("/project/1/task/2", json={"state": "CLOSED"})
+    client.put(f"/project/1/assignment/{assignment['id']}", json={"accepted": True})
+    client.post(
+        "/project/1/task",
+        json={"name": "y", "estimation": 3, "specialization": "BACKEND"},
+    )
+    client.post("/project/1/assignment?incremental=true")
+    client.post("/assignments:batch", json={})
+    for path in ["/project/1/stats", "/developer/1/stats", "/events?project_id=1"]:
+        assert client.get(path).status_code == 200, path
+    client.put("/project/1/task/3", json={"project_id": 2})
+    client.put("/project/2", json={"developers": [1, 2]})
+    client.delete("/project/1/task/4")
+    client.delete(f"/project/1/assignment/{assignment['id']}")
+    client.delete("/developer/3")
+    client.delete("/project/2")
+
+
+def test_filtered_queries_use_indexes(client, captured):
+    run_workload(client)
+
+    checked = set()
+    full_scans = {}
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            if not re.search(r"\bWHERE\b", statement) or statement in checked:
+                # bez WHERE to cała tabela (np. strona listy po id) - skan jest
+                # tu właściwym planem
+                continue
+            checked.add(statement)
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).all()
+            scans = [
+                row.detail
+                for row in plan
+                if row.detail.startswith("SCAN") and "INDEX" not in row.detail
+            ]
+            if scans:
+                full_scans[statement] = scans
+    assert len(checked) > 30
+    assert full_scans == {}
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+
+from app import models
+
+TASK = {"name": "t", "estimation": 3, "specialization": "BACKEND"}
+
+
+def setup_project(client, db, tasks=6):
+    for name in ("a", "b", "c"):
+        client.post(
+            "/developer",
+            json={"first_name": name, "last_name": "b", "specialization": "BACKEND"},
+        ).raise_for_status()
+    client.post(
+        "/project", json={"name": "p", "developer_owner_id": 1, "developers": [1, 2, 3]}
+    ).raise_for_status()
+    # historia sprzed przydziału: estymację 5 najszybciej robi developer 2
+    assigned = datetime(2024, 1, 1)
+    db.add(
+        models.Task(
+            name="done",
+            project_id=1,
+            state="CLOSED",
+            estimation=5,
+            specialization="BACKEND",
+            developer_id=2,
+            datetime_assigned=assigned,
+            datetime_completed=assigned + timedelta(hours=1),
+        )
+    )
+    db.commit()
+    client.post("/project/1/tasks:bulk", json=[TASK] * tasks).raise_for_status()
+    response = client.post("/project/1/assignment")
+    assert response.status_code == 200
+    return response.json()
+
+
+def replan(client):
+    response = client.post("/project/1/assignment?incremental=true")
+    assert response.status_code == 200
+    return response.json()
+
+
+def proposals(db, assignment_id):
+    """task_id -> (id wiersza propozycji, developer_id)"""
+    return {
+        task_id: (change_id, developer_id)
+        for change_id, task_id, developer_id in db.query(
+            models.ProposedChange.id,
+            models.ProposedChange.task_id,
+            models.ProposedChange.developer_id,
+        ).filter(models.ProposedChange.assignment_id == assignment_id)
+    }
+
+
+def test_replan_without_changes_keeps_rows(client, db):
+    assignment = setup_project(client, db)
+    before = proposals(db, assignment["id"])
+    etag = client.get("/project/1").headers["ETag"]
+
+    result = replan(client)
+
+    assert result["id"] == assignment["id"]
+    assert {d: set(t) for d, t in result["changes"].items()} == {
+        d: set(t) for d, t in assignment["changes"].items()
+    }
+    assert proposals(db, assignment["id"]) == before
+    assert client.get("/project/1").headers["ETag"] == etag
+
+
+def test_replan_plans_new_and_changed_tasks(client, db):
+    assignment = setup_project(client, db)
+    before = proposals(db, assignment["id"])
+    changed = next(
+        task_id for task_id, (_, developer_id) in before.items() if developer_id != 2
+    )
+    client.put(f"/project/1/task/{changed}", json={"estimation": 5}).raise_for_status()
+    new = client.post("/project/1/task", json=TASK).json()["id"]
+
+    replan(client)
+
+    after = proposals(db, assignment["id"])
+    assert new in after
+    # zmieniony task idzie do najszybszego dla nowej estymacji
+    assert after[changed][1] == 2
+    for task_id, row in before.items():
+        if task_id != changed:
+            assert after[task_id] == row
+
+
+def test_replan_after_new_history_replans_its_estimation(client, db):
+    # task w toku developera 3 - jego zamknięcie daje nową historię dla estymacji 3
+    setup = setup_project(client, db)
+    in_progress = client.post(
+        "/project/1/task", json={**TASK, "developer_id": 3}
+    ).json()
+    eight = client.post("/project/1/task", json={**TASK, "estimation": 8}).json()["id"]
+    # przydział z taskiem o estymacji 8 - ten nie ma nowej historii
+    client.put(
+        f"/project/1/assignment/{setup['id']}", json={"accepted": False}
+    ).raise_for_status()
+    assignment = client.post("/project/1/assignment").json()
+    before = proposals(db, assignment["id"])
+    client.put(
+        f"/project/1/task/{in_progress['id']}",
+        json={
+            "state": "CLOSED",
+            "datetime_completed": (datetime.utcnow() + timedelta(hours=1)).isoformat(),
+        },
+    ).raise_for_status()
+
+    replan(client)
+
+    after = proposals(db, assignment["id"])
+    # jedyna historia dla estymacji 3 jest developera 3
+    assert {
+        developer_id for task_id, (_, developer_id) in after.items() if task_id != eight
+    } == {3}
+    assert after[eight] == before[eight]
+
+
+def test_replan_moves_tasks_of_removed_developer(client, db):
+    assignment = setup_project(client, db)
+    before = proposals(db, assignment["id"])
+    assert any(developer_id == 3 for _, developer_id in before.values())
+    client.put("/project/1", json={"developers": [1, 2]}).raise_for_status()
+
+    result = replan(client)
+
+    after = proposals(db, assignment["id"])
+    assert set(after) == set(before)
+    assert "3" not in result["changes"]
+    for task_id, (change_id, developer_id) in before.items():
+        if developer_id == 3:
+            assert after[task_id][1] in (1, 2)
+        else:
+            assert after[task_id] == (change_id, developer_id)